@@ -0,0 +1,36 @@
+"""Add comment count column to posts
+
+Revision ID: 3f1d2c7a9b64
+Revises: 8bc88c9198e6
+Create Date: 2026-10-18 09:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1d2c7a9b64'
+down_revision: Union[str, Sequence[str], None] = '8bc88c9198e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE posts
+        SET comment_count = counts.total
+        FROM (SELECT post_id, count(*) AS total FROM comments GROUP BY post_id) AS counts
+        WHERE counts.post_id = posts.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'comment_count')
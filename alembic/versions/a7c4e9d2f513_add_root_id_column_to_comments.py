@@ -0,0 +1,51 @@
+"""Add root id column to comments
+
+Revision ID: a7c4e9d2f513
+Revises: 3f1d2c7a9b64
+Create Date: 2026-10-18 10:04:27.518342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e9d2f513'
+down_revision: Union[str, Sequence[str], None] = '3f1d2c7a9b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('comments', sa.Column('root_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('comments_root_id_fkey', 'comments', 'comments', ['root_id'], ['id'], ondelete='CASCADE')
+    op.execute(
+        """
+        WITH RECURSIVE thread(id, root_id) AS (
+            SELECT id, id FROM comments WHERE parent_id IS NULL
+            UNION ALL
+            SELECT comments.id, thread.root_id FROM comments JOIN thread ON comments.parent_id = thread.id
+        )
+        UPDATE comments
+        SET root_id = thread.root_id
+        FROM thread
+        WHERE thread.id = comments.id AND comments.parent_id IS NOT NULL
+        """
+    )
+    op.create_index('ix_comments_root_id', 'comments', ['root_id'])
+    op.create_index(
+        'ix_comments_post_id_parent_id_like_count_created_at',
+        'comments',
+        ['post_id', 'parent_id', sa.text('like_count DESC'), sa.text('created_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_post_id_parent_id_like_count_created_at', table_name='comments')
+    op.drop_index('ix_comments_root_id', table_name='comments')
+    op.drop_constraint('comments_root_id_fkey', 'comments', type_='foreignkey')
+    op.drop_column('comments', 'root_id')
@@ -0,0 +1,47 @@
+"""Add secondary indexes
+
+Revision ID: b8d3e1f05a92
+Revises: e5b19d3c7f42
+Create Date: 2026-10-18 14:21:07.634190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d3e1f05a92'
+down_revision: Union[str, Sequence[str], None] = 'e5b19d3c7f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_posts_featured_created_at_id',
+        'posts',
+        ['featured', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+    # Keep only the most recently updated featured post before enforcing a single one
+    op.execute(
+        """
+        UPDATE posts SET featured = false
+        WHERE featured AND id <> (
+            SELECT id FROM posts WHERE featured ORDER BY updated_at DESC, id DESC LIMIT 1
+        )
+        """
+    )
+    op.create_index('ix_posts_featured_unique', 'posts', ['featured'], unique=True, postgresql_where=sa.text('featured'))
+    op.create_index('ix_post_tags_tag_id_post_id', 'post_tags', ['tag_id', 'post_id'])
+    op.create_index('ix_comments_parent_id', 'comments', ['parent_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_parent_id', table_name='comments')
+    op.drop_index('ix_post_tags_tag_id_post_id', table_name='post_tags')
+    op.drop_index('ix_posts_featured_unique', table_name='posts')
+    op.drop_index('ix_posts_featured_created_at_id', table_name='posts')
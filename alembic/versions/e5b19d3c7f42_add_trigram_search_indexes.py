@@ -0,0 +1,33 @@
+"""Add trigram search indexes
+
+Revision ID: e5b19d3c7f42
+Revises: c2e8f4a61d07
+Create Date: 2026-10-18 12:02:51.180476
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19d3c7f42'
+down_revision: Union[str, Sequence[str], None] = 'c2e8f4a61d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_posts_title_trgm', 'posts', ['title'], postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_posts_summary_trgm', 'posts', ['summary'], postgresql_using='gin', postgresql_ops={'summary': 'gin_trgm_ops'})
+    op.create_index('ix_tags_name_trgm', 'tags', ['name'], postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tags_name_trgm', table_name='tags')
+    op.drop_index('ix_posts_summary_trgm', table_name='posts')
+    op.drop_index('ix_posts_title_trgm', table_name='posts')
@@ -1,3 +1,4 @@
-from .database import engine, SessionLocal, get_db
+from .database import engine, SessionLocal, get_db, async_engine, AsyncSessionLocal, get_async_db
+from .routing import DatabaseRouter
 
-__all__ = ["engine", "SessionLocal", "get_db"]
+__all__ = ["engine", "SessionLocal", "get_db", "async_engine", "AsyncSessionLocal", "get_async_db", "DatabaseRouter"]
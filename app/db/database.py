@@ -1,14 +1,103 @@
+from uuid import uuid4
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import os
 
-engine = create_engine(os.getenv("DATABASE_URL"))
+from .pool import TimedAsyncAdaptedQueuePool, TimedNullPool, TimedQueuePool
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# "sync" serves requests from Starlette's threadpool over psycopg2, "async"
+# serves them on the event loop over asyncpg
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+
+# "queue" keeps a per-process pool; "null" opens a connection per checkout and
+# is the mode to use behind pgbouncer in transaction pooling mode
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", "0"))
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "blog-api")
+# In async mode requests use the async engine, and the sync engine only
+# serves streamed exports, sitemaps and background flushes
+DB_SYNC_POOL_SIZE = int(os.getenv("DB_SYNC_POOL_SIZE", "2"))
+
+def engine_options(async_driver: bool = False, pool_size: int | None = None, max_overflow: int | None = None) -> dict:
+    """Build create_engine keyword arguments from the DB_* settings, optionally overriding the pool size"""
+    if DB_POOL_MODE == "null":
+        # pgbouncer rejects startup parameters it does not track, so the
+        # timeout has to come from the database role instead
+        if DB_STATEMENT_TIMEOUT:
+            raise ValueError("DB_STATEMENT_TIMEOUT is not supported with DB_POOL_MODE=null, set statement_timeout on the database role instead")
+        options = {"poolclass": TimedNullPool}
+    elif DB_POOL_MODE == "queue":
+        options = {
+            "poolclass": TimedAsyncAdaptedQueuePool if async_driver else TimedQueuePool,
+            "pool_size": DB_POOL_SIZE if pool_size is None else pool_size,
+            "max_overflow": DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE
+        }
+    else:
+        raise ValueError(f"Unknown DB_POOL_MODE: {DB_POOL_MODE}")
+
+    options["pool_pre_ping"] = DB_POOL_PRE_PING
+
+    if async_driver:
+        server_settings = {"application_name": DB_APPLICATION_NAME}
+        if DB_STATEMENT_TIMEOUT:
+            server_settings["statement_timeout"] = str(DB_STATEMENT_TIMEOUT)
+        connect_args = {"server_settings": server_settings}
+        if DB_POOL_MODE == "null":
+            # pgbouncer hands each transaction a different server connection, so
+            # named prepared statements must be unique and never cached
+            connect_args.update({
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__"
+            })
+    else:
+        connect_args = {"application_name": DB_APPLICATION_NAME}
+        if DB_STATEMENT_TIMEOUT:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT}"
+
+    options["connect_args"] = connect_args
+    return options
+
+if DATABASE_MODE == "async":
+    engine = create_engine(DATABASE_URL, **engine_options(pool_size=DB_SYNC_POOL_SIZE, max_overflow=0))
+else:
+    engine = create_engine(DATABASE_URL, **engine_options())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_database_url(url: str) -> str:
+    """Rewrite a sync Postgres URL to use the asyncpg driver"""
+    scheme, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgresql") else url
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DATABASE_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        os.getenv("ASYNC_DATABASE_URL") or get_async_database_url(DATABASE_URL),
+        **engine_options(async_driver=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=True)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
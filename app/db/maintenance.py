@@ -0,0 +1,36 @@
+"""
+Maintenance commands for the blog database.
+
+Usage:
+    python -m app.db.maintenance reconcile-comment-counts
+"""
+import argparse
+
+from .database import SessionLocal
+
+
+def reconcile_comment_counts() -> None:
+    from ..utils.comment_counts import reconcile_comment_counts as reconcile
+
+    db = SessionLocal()
+    try:
+        fixed = reconcile(db)
+    finally:
+        db.close()
+    print(f"Corrected comment counts on {fixed} post(s)")
+
+
+COMMANDS = {
+    "reconcile-comment-counts": reconcile_comment_counts
+}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Blog database maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
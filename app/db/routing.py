@@ -0,0 +1,143 @@
+import functools
+import inspect
+import os
+from typing import Any
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.params import Depends as DependsParam
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from . import database
+from .database import get_db, get_async_db
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serialize response models straight to JSON bytes and render other JSON with orjson
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true"
+
+DEFAULT_RESPONSE_CLASS = ORJSONResponse if FAST_JSON and orjson is not None else JSONResponse
+
+
+def _db_parameter(endpoint) -> str | None:
+    """Return the name of the parameter injected with `Depends(get_db)`"""
+    for parameter in inspect.signature(endpoint).parameters.values():
+        if isinstance(parameter.default, DependsParam) and parameter.default.dependency is get_db:
+            return parameter.name
+    return None
+
+
+def run_in_async_session(endpoint, response_model: Any = None):
+    """
+    Turn a sync `get_db` endpoint into a coroutine endpoint backed by an AsyncSession.
+
+    The handler body runs through `AsyncSession.run_sync`, so its ORM calls are
+    awaited on the event loop instead of blocking a threadpool thread. The
+    result is validated against the response model inside the same greenlet so
+    lazy-loaded relationships are read while the session is still usable.
+    """
+    db_param = _db_parameter(endpoint)
+    if db_param is None or inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    def call(sync_db, args, kwargs):
+        result = endpoint(*args, **{db_param: sync_db}, **kwargs)
+        if adapter is None or isinstance(result, Response):
+            return result
+        return adapter.validate_python(result, from_attributes=True)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        db = kwargs.pop(db_param)
+        return await db.run_sync(call, args, kwargs)
+
+    signature = inspect.signature(endpoint)
+    wrapper.__signature__ = signature.replace(parameters=[
+        parameter.replace(default=Depends(get_async_db)) if parameter.name == db_param else parameter
+        for parameter in signature.parameters.values()
+    ])
+    return wrapper
+
+
+def json_serializer(response_model: Any):
+    """Return a function that validates a result against a response model and dumps it to JSON bytes"""
+    adapter = TypeAdapter(response_model)
+
+    def serialize(result) -> bytes:
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+    return serialize
+
+
+def json_response(content: bytes, response: Response, status_code: int | None = None) -> Response:
+    """Wrap serialized JSON, keeping the status and headers dependencies set on `response`"""
+    rendered = Response(content=content, status_code=response.status_code or status_code or 200, media_type="application/json")
+    rendered.headers.raw.extend(response.headers.raw)
+    return rendered
+
+
+def extend_signature(wrapper, endpoint, **annotations):
+    """Give `wrapper` the endpoint's signature plus keyword-only parameters for FastAPI to inject"""
+    signature = inspect.signature(endpoint)
+    wrapper.__signature__ = signature.replace(parameters=[
+        *signature.parameters.values(),
+        *(inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation) for name, annotation in annotations.items())
+    ])
+    return wrapper
+
+
+def serialize_directly(endpoint, response_model: Any, status_code: int | None = None):
+    """
+    Serialize an endpoint's result in one pydantic-core call.
+
+    FastAPI validates the result, converts it to a dict of JSON-compatible
+    values and then encodes that dict. Here the result is validated and
+    dumped straight to bytes by a TypeAdapter for the response model.
+    Responses returned by the endpoint pass through unchanged.
+    """
+    serialize = json_serializer(response_model)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, _response: Response, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return json_response(serialize(result), _response, status_code)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, _response: Response, **kwargs):
+            result = endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return json_response(serialize(result), _response, status_code)
+
+    return extend_signature(wrapper, endpoint, _response=Response)
+
+
+class DatabaseRouter(APIRouter):
+    """
+    APIRouter whose `get_db` endpoints run on an AsyncSession when DATABASE_MODE=async.
+
+    Endpoints marked with `cache_response` are wrapped with the response
+    cache here, where their response model is known. With FAST_JSON other
+    endpoints with a response model are serialized by `serialize_directly`.
+    """
+
+    def add_api_route(self, path: str, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = response_model.value
+        install_response_cache = getattr(endpoint, "install_response_cache", None)
+        if database.DATABASE_MODE == "async":
+            endpoint = run_in_async_session(endpoint, response_model)
+        if install_response_cache is not None:
+            endpoint = install_response_cache(endpoint, response_model)
+        elif FAST_JSON and response_model is not None:
+            endpoint = serialize_directly(endpoint, response_model, kwargs.get("status_code"))
+        super().add_api_route(path, endpoint, **kwargs)
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -6,14 +7,27 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from .routers import posts, tags, comments, uploads, auth, sitemap, search
+from .routers import posts, tags, comments, uploads, auth, sitemap, search, metrics
+from .db import SessionLocal
+from .db.routing import DEFAULT_RESPONSE_CLASS
+from .utils import counter_flusher, suggestion_index
+from .utils.compression import CompressionMiddleware
 
 limiter = Limiter(key_func=get_remote_address)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    counter_flusher.start()
+    suggestion_index.warm(SessionLocal)
+    yield
+    counter_flusher.stop()
+
 app = FastAPI(
     title="Blog API",
     description="A simple blog API with posts, tags, and comments",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=DEFAULT_RESPONSE_CLASS
 )
 
 app.state.limiter = limiter
@@ -21,6 +35,8 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 cors_origins = os.getenv("CORS_ORIGINS")
 
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins.split(","),
@@ -36,6 +52,7 @@ app.include_router(uploads.router)
 app.include_router(auth.router)
 app.include_router(sitemap.router)
 app.include_router(search.router)
+app.include_router(metrics.router)
 
 app.mount("/uploads", StaticFiles(directory="/app/uploads"), name="uploads")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from . import Base
 
@@ -7,7 +7,9 @@ class Comment(Base):
 
     id = Column(Integer, primary_key=True)
     post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
-    parent_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
+    parent_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True, index=True)
+    # Top-level comment of the thread, NULL for top-level comments themselves
+    root_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True, index=True)
     depth = Column(Integer, nullable=False, default=0)
     author_name = Column(String(100), nullable=False)
     content = Column(Text, nullable=False)
@@ -15,5 +17,9 @@ class Comment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     post = relationship("Post", back_populates="comments")
-    parent = relationship("Comment", remote_side=[id], back_populates="replies")
-    replies = relationship("Comment", back_populates="parent", cascade="all, delete", order_by="Comment.like_count.desc(), Comment.created_at.desc()")
+    parent = relationship("Comment", remote_side=[id], foreign_keys=[parent_id], back_populates="replies")
+    replies = relationship("Comment", back_populates="parent", foreign_keys=[parent_id], cascade="all, delete", order_by="Comment.like_count.desc(), Comment.created_at.desc()")
+
+    __table_args__ = (
+        Index("ix_comments_post_id_parent_id_like_count_created_at", post_id, parent_id, like_count.desc(), created_at.desc()),
+    )
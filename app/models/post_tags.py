@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Index, Integer, ForeignKey
 from . import Base
 
 class PostTag(Base):
     __tablename__ = "post_tags"
 
     post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
-    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
\ No newline at end of file
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+    # The primary key leads with post_id, so tag-to-posts lookups need their own index
+    __table_args__ = (
+        Index("ix_post_tags_tag_id_post_id", tag_id, post_id),
+    )
@@ -1,5 +1,5 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, func, select, table, column
-from sqlalchemy.orm import relationship, column_property
+from sqlalchemy import Boolean, Column, Index, Integer, String, Text, DateTime, func
+from sqlalchemy.orm import query_expression, relationship
 from . import Base
 
 class Post(Base):
@@ -13,16 +13,22 @@ class Post(Base):
     view_count = Column(Integer, nullable=False, default=0)
     read_time_minutes = Column(Integer, nullable=False, default=0)
     featured = Column(Boolean, nullable=False, default=False)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Relevance score, only populated by full-text search queries
+    search_rank = query_expression()
+
     tags = relationship("Tag", secondary="post_tags", back_populates="posts", order_by="Tag.created_at.desc()")
     comments = relationship("Comment", back_populates="post", cascade="all, delete", order_by="Comment.like_count.desc(), Comment.created_at.desc()")
 
-    comment_count = column_property(
-        select(func.count(column("id")))
-        .select_from(table("comments"))
-        .where(column("post_id") == id)
-        .correlate_except(table("comments"))
-        .scalar_subquery()
-    )
\ No newline at end of file
+    __table_args__ = (
+        # Listing order, also the keyset used by cursor pagination
+        Index("ix_posts_featured_created_at_id", featured, created_at.desc(), id.desc()),
+        # At most one post can be featured
+        Index("ix_posts_featured_unique", featured, unique=True, postgresql_where=featured, sqlite_where=featured),
+        # Trigram indexes back substring (ILIKE) and fuzzy (%) search
+        Index("ix_posts_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_posts_summary_trgm", summary, postgresql_using="gin", postgresql_ops={"summary": "gin_trgm_ops"}),
+    )
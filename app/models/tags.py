@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, func
 from sqlalchemy.orm import relationship
 from . import Base
 
@@ -11,4 +11,8 @@ class Tag(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    posts = relationship("Post", secondary="post_tags", back_populates="tags", order_by="Post.created_at.desc()")
\ No newline at end of file
+    posts = relationship("Post", secondary="post_tags", back_populates="tags", order_by="Post.created_at.desc()")
+
+    __table_args__ = (
+        Index("ix_tags_name_trgm", name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session, joinedload
-from app.utils import limiter, view_cache
+import os
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.utils import limiter, view_cache, paginate, invalidate
 from slowapi.util import get_remote_address
 from app.utils.auth import verify_admin
 
-from ..db import get_db
+from ..db import DatabaseRouter, get_db
 from ..models import Comment, Post
 from ..schemas import CommentResponse, CommentCreate, PaginatedResponse
+from ..utils.comment_counts import adjust_comment_count, count_comment_subtree
+from ..utils.comment_tree import build_comment_tree, load_comment_trees
+from ..utils.counters import REACTION_BUFFERING, like_counter
+from ..utils.http_cache import version_validator
+from ..utils.response_cache import cache_response
 
-router = APIRouter(
+COMMENT_CACHE_CONTROL = os.getenv("COMMENT_CACHE_CONTROL", "public, max-age=10, stale-while-revalidate=60")
+
+router = DatabaseRouter(
     prefix="/comments",
     tags=["comments"]
 )
@@ -16,24 +27,27 @@ router = APIRouter(
 @router.get("/{comment_id}", response_model=CommentResponse)
 def get_comment(comment_id: int, db: Session = Depends(get_db)):
     """Get a comment by ID"""
-    comment = db.query(Comment).options(joinedload(Comment.replies)).filter(Comment.id == comment_id).first()
+    comment = db.query(Comment).filter(Comment.id == comment_id).first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
+    load_comment_trees(db, [comment])
     return comment
 
-@router.get("/post/{post_id}", response_model=PaginatedResponse[CommentResponse])
-def get_comments_by_post(post_id: int, offset: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+@router.get("/post/{post_id}", response_model=PaginatedResponse[CommentResponse], dependencies=[Depends(version_validator(["comments:{post_id}"], COMMENT_CACHE_CONTROL))])
+@cache_response(["comments:{post_id}"])
+def get_comments_by_post(post_id: int, offset: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db)):
     """Get all comments for a specific post with pagination"""
-    query = db.query(Comment).options(joinedload(Comment.replies)).filter(Comment.post_id == post_id, Comment.parent_id == None).order_by(Comment.like_count.desc(), Comment.created_at.desc())
-    total = query.count()
-    comments = query.offset(offset).limit(limit).all()
-    return PaginatedResponse(items=comments, total=total, offset=offset, limit=limit)
+    query = db.query(Comment).filter(Comment.post_id == post_id, Comment.parent_id == None)
+    page = paginate(query, [Comment.like_count, Comment.created_at, Comment.id], offset, limit, cursor, include_total, count_key=f"comments:{post_id}", count_tags=[f"comments:{post_id}"])
+    load_comment_trees(db, page.items)
+    return page
 
-@router.get("/post/{post_id}/all", response_model=list[CommentResponse])
+@router.get("/post/{post_id}/all", response_model=list[CommentResponse], dependencies=[Depends(version_validator(["comments:{post_id}"], COMMENT_CACHE_CONTROL))])
+@cache_response(["comments:{post_id}"])
 def get_all_comments_by_post(post_id: int, db: Session = Depends(get_db)):
     """Get all comments for a specific post without pagination"""
-    comments = db.query(Comment).options(joinedload(Comment.replies)).filter(Comment.post_id == post_id, Comment.parent_id == None).order_by(Comment.like_count.desc(), Comment.created_at.desc()).all()
-    return comments
+    comments = db.query(Comment).filter(Comment.post_id == post_id).all()
+    return build_comment_tree(comments)
 
 @router.post("/", response_model=CommentResponse, status_code=201)
 @limiter.limit("3/minute")
@@ -56,56 +70,68 @@ def create_comment(request: Request, comment_data: CommentCreate, db: Session =
     new_comment = Comment(
         post_id=comment_data.post_id,
         parent_id=comment_data.parent_id,
+        root_id=(parent_comment.root_id or parent_comment.id) if comment_data.parent_id else None,
         depth=parent_comment.depth + 1 if comment_data.parent_id else 0,
         author_name=comment_data.author_name,
         content=comment_data.content
     )
 
     db.add(new_comment)
+    adjust_comment_count(db, comment_data.post_id, 1)
     db.commit()
     db.refresh(new_comment)
+    invalidate(f"comments:{comment_data.post_id}", f"post:{comment_data.post_id}", "post-stats")
 
     return new_comment
 
+def react_to_comment(request: Request, comment_id: int, reaction: str, delta: int, db: Session) -> CommentResponse:
+    """
+    Add `delta` to a comment's like count, once per client and reaction.
+
+    The count is changed by a single `UPDATE ... RETURNING` that yields the
+    response row, so concurrent reactions never overwrite each other. With
+    REACTION_BUFFERING the delta is buffered and written in batches instead.
+    The response carries the new count but not the comment's replies.
+    """
+    first_reaction = view_cache.add(f"{reaction}:{comment_id}:{get_remote_address(request)}")
+    write_now = first_reaction and not REACTION_BUFFERING
+    if write_now:
+        comment = db.scalars(
+            update(Comment)
+            .where(Comment.id == comment_id)
+            .values(like_count=Comment.like_count + delta)
+            .returning(Comment)
+        ).first()
+    else:
+        comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    # Replies are not part of a reaction response; skip loading them
+    set_committed_value(comment, "replies", [])
+    # Built before committing, since the commit expires the returned row
+    response = CommentResponse.model_validate(comment)
+    if write_now:
+        db.commit()
+        invalidate(f"comments:{comment.post_id}")
+    elif first_reaction:
+        like_counter.increment(comment.id, delta, invalidates=(f"comments:{comment.post_id}",))
+
+    return response.model_copy(update={"like_count": response.like_count + like_counter.pending(comment.id)})
+
 @router.post("/{comment_id}/like", response_model=CommentResponse)
 @limiter.limit("10/minute")
 @limiter.limit("100/hour")
 def like_comment(request: Request, comment_id: int, db: Session = Depends(get_db)):
     """Like a comment by incrementing its like count"""
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=404, detail="Comment not found")
-
-    client_ip = get_remote_address(request)
-    cache_key = f"like:{comment.id}:{client_ip}"
-
-    if cache_key not in view_cache:
-        comment.like_count += 1
-        db.commit()
-        db.refresh(comment)
-        view_cache[cache_key] = True
-
-    return comment
+    return react_to_comment(request, comment_id, "like", 1, db)
 
 @router.post("/{comment_id}/dislike", response_model=CommentResponse)
 @limiter.limit("10/minute")
 @limiter.limit("100/hour")
 def dislike_comment(request: Request, comment_id: int, db: Session = Depends(get_db)):
     """Dislike a comment by decrementing its like count"""
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=404, detail="Comment not found")
-
-    client_ip = get_remote_address(request)
-    cache_key = f"dislike:{comment.id}:{client_ip}"
-
-    if cache_key not in view_cache:
-        comment.like_count -= 1
-        db.commit()
-        db.refresh(comment)
-        view_cache[cache_key] = True
-
-    return comment
+    return react_to_comment(request, comment_id, "dislike", -1, db)
 
 @router.delete("/{comment_id}", status_code=204)
 def delete_comment(comment_id: int, db: Session = Depends(get_db), _ = Depends(verify_admin)):
@@ -114,7 +140,11 @@ def delete_comment(comment_id: int, db: Session = Depends(get_db), _ = Depends(v
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
 
+    removed = count_comment_subtree(db, comment.id)
     db.delete(comment)
+    adjust_comment_count(db, comment.post_id, -removed)
     db.commit()
+    like_counter.discard(comment_id)
+    invalidate(f"comments:{comment.post_id}", f"post:{comment.post_id}", "post-stats")
 
     return None
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+
+from app.utils.auth import verify_admin
+from ..db import engine, async_engine
+from ..db.pool import pool_status
+from ..utils import view_cache
+from ..utils.cache import app_cache, response_cache
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"]
+)
+
+@router.get("/")
+def get_metrics(_ = Depends(verify_admin)):
+    """Get cache and connection pool counters for this worker"""
+    return {
+        "caches": {
+            "view_cache": view_cache.info(),
+            "app_cache": app_cache.info(),
+            "response_cache": response_cache.info()
+        },
+        "pools": {
+            "sync": pool_status(engine),
+            "async": pool_status(async_engine)
+        }
+    }
@@ -1,49 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+import os
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 from slowapi.util import get_remote_address
-from app.utils import view_cache
+from app.utils import view_cache, view_counter, invalidate, suggestion_index
 from app.utils.auth import verify_admin
 
-from ..db import get_db
-from ..models import Post, Tag
-from ..schemas import PostResponse, PostCreate, PostUpdate, PaginatedResponse
-from ..utils import slugify, validate_unique_slug, calculate_read_time
+from ..db import DatabaseRouter, SessionLocal, get_db
+from ..models import Post, PostTag, Tag
+from ..schemas import PostResponse, PostSummary, PostView, PostCreate, PostUpdate, PostRecord, PostImportResponse, PaginatedResponse
+from ..utils import slugify, validate_unique_slug, unique_slug, commit_unique, reporting_conflicts, calculate_read_time, paginate
+from ..utils.bulk_posts import IMPORT_OPENAPI, export_post_records, import_posts, read_post_records
+from ..utils.featured import feature_post, featured_post_id
+from ..utils.http_cache import version_validator
+from ..utils.post_views import apply_view, render_view
+from ..utils.response_cache import cache_response, cached_value
 
-router = APIRouter(
+POST_CACHE_CONTROL = os.getenv("POST_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300")
+
+# Cache tags each read depends on
+POST_LIST_TAGS = ["post-list", "post-stats"]
+POSTS_BY_TAG_TAGS = ["post-list", "post-stats", "tag-list"]
+POST_TAGS = ["post:{post_id}", "post-stats", "tag-list"]
+
+router = DatabaseRouter(
     prefix="/posts",
     tags=["posts"]
 )
 
-@router.get("/", response_model=PaginatedResponse[PostResponse])
-def get_posts(offset: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+@router.get("/", response_model=PaginatedResponse[PostResponse | PostSummary], dependencies=[Depends(version_validator(POST_LIST_TAGS, POST_CACHE_CONTROL))])
+@cache_response(POST_LIST_TAGS)
+def get_posts(offset: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = False, view: PostView = "full", db: Session = Depends(get_db)):
     """Get all posts with pagination, excluding featured post"""
-    query = db.query(Post).options(joinedload(Post.tags)).filter(Post.featured == False).order_by(Post.created_at.desc())
-    total = query.count()
-    posts = query.offset(offset).limit(limit).all()
-    return PaginatedResponse(items=posts, total=total, offset=offset, limit=limit)
-
-@router.get("/featured", response_model=PostResponse)
-def get_featured_post(db: Session = Depends(get_db)):
+    query = apply_view(db.query(Post).options(selectinload(Post.tags)).filter(Post.featured == False), view)
+    page = paginate(query, [Post.created_at, Post.id], offset, limit, cursor, include_total, count_key="posts", count_tags=["post-list"])
+    page.items = render_view(page.items, view)
+    return page
+
+@router.get("/featured", response_model=PostResponse | PostSummary, dependencies=[Depends(version_validator(POST_LIST_TAGS, POST_CACHE_CONTROL))])
+@cache_response(POST_LIST_TAGS)
+def get_featured_post(view: PostView = "full", db: Session = Depends(get_db)):
     """Get the featured post"""
-    post = db.query(Post).options(joinedload(Post.tags)).filter(Post.featured == True).first()
+    post_id = featured_post_id(db)
+    post = None
+    if post_id is not None:
+        post = apply_view(db.query(Post).options(joinedload(Post.tags)), view).filter(Post.id == post_id, Post.featured == True).first()
     if not post:
         raise HTTPException(status_code=404, detail="No featured post found")
-    return post
+    return render_view([post], view)[0]
 
-@router.get("/tag/{tag_slug}", response_model=PaginatedResponse[PostResponse])
-def get_posts_by_tag(tag_slug: str, offset: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+@router.get("/tag/{tag_slug}", response_model=PaginatedResponse[PostResponse | PostSummary], dependencies=[Depends(version_validator(POSTS_BY_TAG_TAGS, POST_CACHE_CONTROL))])
+@cache_response(POSTS_BY_TAG_TAGS)
+def get_posts_by_tag(tag_slug: str, offset: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = False, view: PostView = "full", db: Session = Depends(get_db)):
     """Get all posts for a specific tag"""
     tag = db.query(Tag).filter(Tag.slug == tag_slug).first()
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    query = db.query(Post).options(joinedload(Post.tags)).join(Post.tags).filter(Tag.id == tag.id).order_by(Post.created_at.desc())
-    total = query.count()
-    posts = query.offset(offset).limit(limit).all()
-    return PaginatedResponse(items=posts, total=total, offset=offset, limit=limit)
-
-@router.get("/{post_id}", response_model=PostResponse)
+    query = apply_view(db.query(Post).options(selectinload(Post.tags)).join(PostTag, PostTag.post_id == Post.id).filter(PostTag.tag_id == tag.id), view)
+    page = paginate(query, [Post.created_at, Post.id], offset, limit, cursor, include_total, count_key=f"posts:tag:{tag.id}", count_tags=["post-list", f"tag:{tag.id}"])
+    page.items = render_view(page.items, view)
+    return page
+
+@router.get("/export")
+def export_posts(_ = Depends(verify_admin)):
+    """Stream every post with its tags and comments as NDJSON"""
+    def generate():
+        # The request's session is released before a streamed body is sent
+        db = SessionLocal()
+        try:
+            yield from export_post_records(db)
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/{post_id}", response_model=PostResponse, dependencies=[Depends(version_validator(POST_TAGS, POST_CACHE_CONTROL))])
+@cache_response(POST_TAGS)
 def get_post(post_id: int, db: Session = Depends(get_db)):
     """Get a post by ID"""
     post = db.query(Post).options(joinedload(Post.tags)).filter(Post.id == post_id).first()
@@ -54,33 +88,31 @@ def get_post(post_id: int, db: Session = Depends(get_db)):
 @router.get("/slug/{slug}", response_model=PostResponse)
 def get_post_by_slug(request: Request, slug: str, db: Session = Depends(get_db)):
     """Get a post by slug and increment view count"""
-    post = db.query(Post).options(joinedload(Post.tags)).filter(Post.slug == slug).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
+    def load():
+        post = db.query(Post).options(joinedload(Post.tags)).filter(Post.slug == slug).first()
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return PostResponse.model_validate(post).model_dump_json()
+
+    # The view is counted on every request, so only the lookup is cached
+    post = PostResponse.model_validate_json(cached_value(f"post:slug:{slug}", ["post-list", "post-stats"], load))
 
     client_ip = get_remote_address(request)
     cache_key = f"{post.id}:{client_ip}"
 
-    if cache_key not in view_cache:
-        post.view_count += 1
-        db.commit()
-        db.refresh(post)
-        view_cache[cache_key] = True
+    if view_cache.add(cache_key):
+        view_counter.increment(post.id)
 
-    return post
+    return post.model_copy(update={"view_count": post.view_count + view_counter.pending(post.id)})
 
 @router.post("/", response_model=PostResponse, status_code=201)
 def create_post(post_data: PostCreate, db: Session = Depends(get_db), _ = Depends(verify_admin)):
     """Create a post"""
     if post_data.slug:
         slug = post_data.slug
+        validate_unique_slug(slug, Post, db)
     else:
-        slug = slugify(post_data.title)
-
-    validate_unique_slug(slug, Post, db)
-
-    if post_data.featured:
-        db.query(Post).filter(Post.featured == True).update({Post.featured: False})
+        slug = unique_slug(slugify(post_data.title), Post, db)
 
     read_time = calculate_read_time(post_data.content)
 
@@ -93,6 +125,9 @@ def create_post(post_data: PostCreate, db: Session = Depends(get_db), _ = Depend
         featured=post_data.featured
     )
 
+    if post_data.featured:
+        feature_post(db, new_post)
+
     if post_data.tag_ids:
         tags = db.query(Tag).filter(Tag.id.in_(post_data.tag_ids)).all()
         if len(tags) != len(post_data.tag_ids):
@@ -100,11 +135,24 @@ def create_post(post_data: PostCreate, db: Session = Depends(get_db), _ = Depend
         new_post.tags = tags
 
     db.add(new_post)
-    db.commit()
+    commit_unique(db, Post)
     db.refresh(new_post)
+    tokens = invalidate("post-list")
+    suggestion_index.update_post(new_post, tokens)
 
     return new_post
 
+@router.post("/bulk", response_model=PostImportResponse, status_code=201, openapi_extra=IMPORT_OPENAPI)
+def import_posts_in_bulk(db: Session = Depends(get_db), _ = Depends(verify_admin), records: list[PostRecord] = Depends(read_post_records)):
+    """Import posts with their tags and comments from NDJSON or a JSON array"""
+    # The inserts run before the commit, so either can hit a unique constraint
+    with reporting_conflicts(db, Post):
+        result = import_posts(db, records)
+        db.commit()
+    invalidate("post-list", "tag-list", "post-stats")
+
+    return result
+
 @router.patch("/{post_id}", response_model=PostResponse)
 def update_post(post_id: int, post_data: PostUpdate, db: Session = Depends(get_db), _ = Depends(verify_admin)):
     """Update a post"""
@@ -134,16 +182,12 @@ def update_post(post_id: int, post_data: PostUpdate, db: Session = Depends(get_d
 
     if post_data.view_count is not None:
         post.view_count = post_data.view_count
+        view_counter.discard(post_id)
 
-    if post_data.featured is not None:
-        if post_data.featured:
-            db.query(Post).filter(
-                and_(
-                    Post.featured == True,
-                    Post.id != post_id
-                )
-            ).update({Post.featured: False})
-        post.featured = post_data.featured
+    if post_data.featured:
+        feature_post(db, post)
+    elif post_data.featured is not None:
+        post.featured = False
 
     if post_data.tag_ids is not None:
         if post_data.tag_ids:
@@ -154,8 +198,10 @@ def update_post(post_id: int, post_data: PostUpdate, db: Session = Depends(get_d
         else:
             post.tags = []
 
-    db.commit()
+    commit_unique(db, Post)
     db.refresh(post)
+    tokens = invalidate("post-list", f"post:{post_id}")
+    suggestion_index.update_post(post, tokens)
 
     return post
 
@@ -168,5 +214,8 @@ def delete_post(post_id: int, db: Session = Depends(get_db), _ = Depends(verify_
 
     db.delete(post)
     db.commit()
+    view_counter.discard(post_id)
+    tokens = invalidate("post-list", f"post:{post_id}", f"comments:{post_id}")
+    suggestion_index.remove_post(post_id, tokens)
 
     return None
@@ -1,36 +1,40 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from fastapi import Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
-from app.db.database import get_db
-from app.models.posts import Post
-from app.models.tags import Tag
-from app.schemas.pagination import PaginatedResponse
-from app.schemas.search import SearchResponse
+from app.db import DatabaseRouter, get_db
+from app.schemas import PostView
+from app.schemas.search import SearchResponse, SuggestResponse
+from app.utils.pagination import paginate
+from app.utils.post_views import apply_view, render_view
+from app.utils.response_cache import cache_response
+from app.utils.search import SEARCH_BACKEND, TAG_SEARCH_LIMIT, search_posts, search_tags
+from app.utils.suggestions import suggestion_index
 
-router = APIRouter(prefix="/search", tags=["search"])
+router = DatabaseRouter(prefix="/search", tags=["search"])
 
 
 @router.get("/autocomplete", response_model=SearchResponse)
-def autocomplete_search(q: str = Query(..., min_length=1), offset: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+@cache_response(["post-list", "post-stats", "tag-list"])
+def autocomplete_search(q: str = Query(..., min_length=1), offset: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = False, view: PostView = "full", db: Session = Depends(get_db)):
     """Autocomplete search endpoint for posts and tags"""
 
-    # Search posts by title or summary
-    posts_query = db.query(Post).filter(
-        or_(
-            Post.title.ilike(f"%{q}%"),
-            Post.summary.ilike(f"%{q}%")
-        )
-    ).order_by(Post.view_count.desc(), Post.created_at.desc())
-    total_posts = posts_query.count()
-    posts = posts_query.offset(offset).limit(limit).all()
+    # Search posts with the configured backend
+    posts_query, order_by = search_posts(db, q)
+    posts_page = paginate(apply_view(posts_query, view), order_by, offset, limit, cursor, include_total, count_key=f"search:{SEARCH_BACKEND}:{q.lower()}", count_tags=["post-list"])
+
+    posts_page.items = render_view(posts_page.items, view)
 
     # Search tags by name
-    tags = db.query(Tag).filter(
-        Tag.name.ilike(f"%{q}%")
-    ).order_by(Tag.created_at.desc()).limit(5).all()
+    tags = search_tags(db, q).limit(TAG_SEARCH_LIMIT).all()
 
     return SearchResponse(
-        posts=PaginatedResponse(items=posts, total=total_posts, offset=offset, limit=limit),
+        posts=posts_page,
         tags=tags
     )
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+    """Suggest post titles and tag names matching a partial query from the in-memory index"""
+    return suggestion_index.suggest(db, q, limit)
@@ -1,23 +1,48 @@
-from fastapi import APIRouter, Depends, Response
+import os
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 from email.utils import format_datetime
 from datetime import timezone
 
-from ..db import get_db
+from ..db import DatabaseRouter, SessionLocal, get_db
 from ..models import Post, Tag
+from ..utils.http_cache import cached_body, conditional_response, not_modified, version_etag
 
-router = APIRouter(
+FEED_CACHE_CONTROL = os.getenv("FEED_CACHE_CONTROL", "public, max-age=300")
+SITEMAP_SHARD_SIZE = int(os.getenv("SITEMAP_SHARD_SIZE", "50000"))
+SITEMAP_STREAM_BATCH = 1000
+
+SITE_URL = "https://blog.jacobarthurs.com"
+
+router = DatabaseRouter(
     tags=["sitemap"]
 )
 
+def _last_modified(*dates):
+    return max((date for date in dates if date is not None), default=None)
+
 @router.get("/sitemap.xml")
-def get_sitemap(db: Session = Depends(get_db)):
+def get_sitemap(request: Request, db: Session = Depends(get_db)):
+    """Serve the XML sitemap for all posts and tags, regenerated only when they change"""
+    body = cached_body("sitemap.xml", ["post-list", "tag-list"], lambda: build_sitemap(db))
+    return conditional_response(request, body, "application/xml", FEED_CACHE_CONTROL)
+
+@router.get("/rss.xml")
+def get_rss_feed(request: Request, db: Session = Depends(get_db)):
+    """Serve the RSS 2.0 feed for all blog posts, regenerated only when they change"""
+    body = cached_body("rss.xml", ["post-list"], lambda: build_rss(db))
+    return conditional_response(request, body, "application/xml", FEED_CACHE_CONTROL)
+
+def build_sitemap(db: Session):
     """Generate XML sitemap for all posts and tags"""
-    
-    # Fetch all posts and tags
-    posts = db.query(Post).all()
-    tags = db.query(Tag).all()
+
+    # Fetch only the columns the sitemap needs
+    posts = db.query(Post.slug, Post.created_at, Post.updated_at).all()
+    tags = db.query(Tag.slug, Tag.updated_at).all()
     
     # Build XML sitemap
     urlset = ET.Element("urlset", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
@@ -48,15 +73,14 @@ def get_sitemap(db: Session = Depends(get_db)):
         ET.SubElement(url, "priority").text = "0.6"
     
     xml_bytes = ET.tostring(urlset, encoding="UTF-8", method="xml", xml_declaration=True)
-    return Response(content=xml_bytes, media_type="application/xml")
-
+    last_modified = _last_modified(*(post.updated_at for post in posts), *(tag.updated_at for tag in tags))
+    return xml_bytes, last_modified
 
-@router.get("/rss.xml")
-def get_rss_feed(db: Session = Depends(get_db)):
+def build_rss(db: Session):
     """Generate RSS 2.0 feed for all blog posts"""
 
-    # Fetch all posts ordered by creation date
-    posts = db.query(Post).order_by(Post.created_at.desc()).all()
+    # Fetch the feed columns ordered by creation date
+    posts = db.query(Post.title, Post.slug, Post.summary, Post.created_at, Post.updated_at).order_by(Post.created_at.desc()).all()
 
     # Build RSS feed
     rss = ET.Element("rss", version="2.0", attrib={"xmlns:atom": "http://www.w3.org/2005/Atom"})
@@ -99,4 +123,88 @@ def get_rss_feed(db: Session = Depends(get_db)):
         ET.SubElement(item, "pubDate").text = pub_date
 
     xml_bytes = ET.tostring(rss, encoding="UTF-8", method="xml", xml_declaration=True)
-    return Response(content=xml_bytes, media_type="application/xml")
+    return xml_bytes, _last_modified(*(post.updated_at for post in posts))
+
+@router.get("/sitemap_index.xml")
+def get_sitemap_index(request: Request, db: Session = Depends(get_db)):
+    """Serve the sitemap index pointing at the post and tag sitemap shards"""
+    body = cached_body("sitemap_index.xml", ["post-list", "tag-list"], lambda: build_sitemap_index(db))
+    return conditional_response(request, body, "application/xml", FEED_CACHE_CONTROL)
+
+@router.get("/sitemap-posts-{shard}.xml")
+def get_posts_sitemap(request: Request, shard: int, db: Session = Depends(get_db)):
+    """Stream one shard of at most SITEMAP_SHARD_SIZE post URLs, ordered by post ID"""
+    if shard < 1:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    offset = (shard - 1) * SITEMAP_SHARD_SIZE
+    if shard > 1 and db.query(Post.id).order_by(Post.id).offset(offset).limit(1).first() is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+
+    etag = version_etag(["post-list"], f"posts-{shard}")
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": FEED_CACHE_CONTROL})
+
+    statement = select(Post.slug, Post.updated_at).order_by(Post.id).offset(offset).limit(SITEMAP_SHARD_SIZE)
+    return _stream_urlset(statement, "post", "monthly", "0.8", etag)
+
+@router.get("/sitemap-tags.xml")
+def get_tags_sitemap(request: Request):
+    """Stream the URLs of all tags"""
+    etag = version_etag(["tag-list"], "tags")
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": FEED_CACHE_CONTROL})
+
+    statement = select(Tag.slug, Tag.updated_at).order_by(Tag.id)
+    return _stream_urlset(statement, "tag", "monthly", "0.6", etag)
+
+def build_sitemap_index(db: Session):
+    """Generate the sitemap index with one entry per post shard plus the tag sitemap"""
+
+    # Number posts by ID and take each shard's newest update in one pass
+    numbered = select(
+        Post.updated_at,
+        ((func.row_number().over(order_by=Post.id) - 1) // SITEMAP_SHARD_SIZE).label("shard")
+    ).subquery()
+    shards = db.query(numbered.c.shard, func.max(numbered.c.updated_at)).group_by(numbered.c.shard).order_by(numbered.c.shard).all()
+    tags_modified = db.query(func.max(Tag.updated_at)).scalar()
+
+    entries = [(f"{SITE_URL}/sitemap-posts-{shard + 1}.xml", lastmod) for shard, lastmod in shards]
+    if not entries:
+        entries.append((f"{SITE_URL}/sitemap-posts-1.xml", None))
+    entries.append((f"{SITE_URL}/sitemap-tags.xml", tags_modified))
+
+    index = ET.Element("sitemapindex", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
+    for loc, lastmod in entries:
+        sitemap = ET.SubElement(index, "sitemap")
+        ET.SubElement(sitemap, "loc").text = loc
+        if lastmod is not None:
+            ET.SubElement(sitemap, "lastmod").text = lastmod.strftime("%Y-%m-%d")
+
+    xml_bytes = ET.tostring(index, encoding="UTF-8", method="xml", xml_declaration=True)
+    return xml_bytes, _last_modified(*(lastmod for _, lastmod in entries))
+
+def _stream_urlset(statement, path: str, changefreq: str, priority: str, etag: str) -> StreamingResponse:
+    """
+    Stream a urlset document from a server-side cursor.
+
+    The generator opens its own session, since the request's session is
+    released before a streamed body is sent, and renders rows in batches so
+    memory stays flat however many URLs the shard holds.
+    """
+    def generate():
+        yield b'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        db = SessionLocal()
+        try:
+            result = db.execute(statement.execution_options(yield_per=SITEMAP_STREAM_BATCH))
+            for rows in result.partitions():
+                yield "".join(
+                    f"<url><loc>{SITE_URL}/{path}/{escape(slug)}</loc>"
+                    f"<lastmod>{updated_at.strftime('%Y-%m-%d')}</lastmod>"
+                    f"<changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>"
+                    for slug, updated_at in rows
+                ).encode()
+        finally:
+            db.close()
+        yield b"</urlset>"
+
+    return StreamingResponse(generate(), media_type="application/xml", headers={"ETag": etag, "Cache-Control": FEED_CACHE_CONTROL})
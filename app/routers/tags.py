@@ -1,33 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+import os
+from typing import Optional
+from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.utils.auth import verify_admin
 
-from ..db import get_db
+from ..db import DatabaseRouter, get_db
 from ..models import Tag
 from ..schemas import TagResponse, TagCreate, TagUpdate, PaginatedResponse
-from ..utils import slugify, validate_unique_slug
+from ..utils import slugify, validate_unique_slug, unique_slug, commit_unique, paginate, invalidate, suggestion_index
+from ..utils.http_cache import version_validator
+from ..utils.response_cache import cache_response
 
-router = APIRouter(
+TAG_CACHE_CONTROL = os.getenv("TAG_CACHE_CONTROL", "public, max-age=300, stale-while-revalidate=3600")
+
+router = DatabaseRouter(
     prefix="/tags",
     tags=["tags"]
 )
 
-@router.get("/", response_model=PaginatedResponse[TagResponse])
-def get_tags(offset: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+@router.get("/", response_model=PaginatedResponse[TagResponse], dependencies=[Depends(version_validator(["tag-list"], TAG_CACHE_CONTROL))])
+@cache_response(["tag-list"])
+def get_tags(offset: int = 0, limit: int = 10, cursor: Optional[str] = None, include_total: bool = False, db: Session = Depends(get_db)):
     """Get all tags with pagination"""
-    query = db.query(Tag).order_by(Tag.name.desc())
-    total = query.count()
-    tags = query.offset(offset).limit(limit).all()
-    return PaginatedResponse(items=tags, total=total, offset=offset, limit=limit)
+    return paginate(db.query(Tag), [Tag.name, Tag.id], offset, limit, cursor, include_total, count_key="tags", count_tags=["tag-list"])
 
-@router.get("/all", response_model=list[TagResponse])
+@router.get("/all", response_model=list[TagResponse], dependencies=[Depends(version_validator(["tag-list"], TAG_CACHE_CONTROL))])
+@cache_response(["tag-list"])
 def get_all_tags(db: Session = Depends(get_db)):
     """Get all tags without pagination"""
     tags = db.query(Tag).order_by(Tag.name.desc()).all()
     return tags
 
-@router.get("/{tag_id}", response_model=TagResponse)
+@router.get("/{tag_id}", response_model=TagResponse, dependencies=[Depends(version_validator(["tag:{tag_id}"], TAG_CACHE_CONTROL))])
+@cache_response(["tag:{tag_id}"])
 def get_tag(tag_id: int, db: Session = Depends(get_db)):
     """Get a tag by ID"""
     tag = db.query(Tag).filter(Tag.id == tag_id).first()
@@ -35,7 +41,8 @@ def get_tag(tag_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Tag not found")
     return tag
 
-@router.get("/slug/{slug}", response_model=TagResponse)
+@router.get("/slug/{slug}", response_model=TagResponse, dependencies=[Depends(version_validator(["tag-list"], TAG_CACHE_CONTROL))])
+@cache_response(["tag-list"])
 def get_tag_by_slug(slug: str, db: Session = Depends(get_db)):
     """Get a tag by slug"""
     tag = db.query(Tag).filter(Tag.slug == slug).first()
@@ -48,10 +55,9 @@ def create_tag(tag_data: TagCreate, db: Session = Depends(get_db), _ = Depends(v
     """Create a tag"""
     if tag_data.slug:
         slug = tag_data.slug
+        validate_unique_slug(slug, Tag, db)
     else:
-        slug = slugify(tag_data.name)
-
-    validate_unique_slug(slug, Tag, db)
+        slug = unique_slug(slugify(tag_data.name), Tag, db)
 
     new_tag = Tag(
         name=tag_data.name,
@@ -59,8 +65,10 @@ def create_tag(tag_data: TagCreate, db: Session = Depends(get_db), _ = Depends(v
     )
 
     db.add(new_tag)
-    db.commit()
+    commit_unique(db, Tag)
     db.refresh(new_tag)
+    tokens = invalidate("tag-list")
+    suggestion_index.update_tag(new_tag, tokens)
 
     return new_tag
 
@@ -84,8 +92,10 @@ def update_tag(tag_id: int, tag_data: TagUpdate, db: Session = Depends(get_db),
             validate_unique_slug(new_slug, Tag, db)
         tag.slug = new_slug
 
-    db.commit()
+    commit_unique(db, Tag)
     db.refresh(tag)
+    tokens = invalidate("tag-list", f"tag:{tag_id}", "post-list")
+    suggestion_index.update_tag(tag, tokens)
 
     return tag
 
@@ -98,5 +108,7 @@ def delete_tag(tag_id: int, db: Session = Depends(get_db), _ = Depends(verify_ad
 
     db.delete(tag)
     db.commit()
+    tokens = invalidate("tag-list", f"tag:{tag_id}", "post-list")
+    suggestion_index.remove_tag(tag_id, tokens)
 
     return None
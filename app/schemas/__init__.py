@@ -1,19 +1,24 @@
-from .posts import PostResponse, PostCreate, PostUpdate
+from .posts import PostResponse, PostSummary, PostView, PostCreate, PostUpdate, PostRecord, PostImportResponse
 from .tags import TagResponse, TagCreate, TagUpdate
-from .comments import CommentResponse, CommentCreate
+from .comments import CommentResponse, CommentCreate, CommentRecord
 from .auth import TokenResponse
 from .uploads import UploadResponse
 from .pagination import PaginatedResponse
 
 __all__ = [
     "PostResponse",
+    "PostSummary",
+    "PostView",
     "PostCreate",
     "PostUpdate",
+    "PostRecord",
+    "PostImportResponse",
     "TagResponse",
     "TagCreate",
     "TagUpdate",
     "CommentResponse",
     "CommentCreate",
+    "CommentRecord",
     "TokenResponse",
     "UploadResponse",
     "PaginatedResponse"
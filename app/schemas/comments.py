@@ -8,6 +8,15 @@ class CommentCreate(BaseModel):
     author_name: str = Field(..., min_length=2, max_length=100)
     content: str = Field(..., min_length=1, max_length=2000)
 
+class CommentRecord(BaseModel):
+    """A comment in a bulk export or import; `id` and `parent_id` are the source database's ids"""
+    id: int
+    parent_id: Optional[int] = None
+    author_name: str = Field(..., min_length=2, max_length=100)
+    content: str = Field(..., min_length=1, max_length=2000)
+    like_count: int = 0
+    created_at: Optional[datetime] = None
+
 class CommentResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
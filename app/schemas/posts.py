@@ -1,8 +1,9 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from app.schemas.tags import TagResponse
+from app.schemas.comments import CommentRecord
+from app.schemas.tags import TagCreate, TagResponse
 
 class PostCreate(BaseModel):
     title: str
@@ -21,14 +22,34 @@ class PostUpdate(BaseModel):
     tag_ids: Optional[List[int]] = None
     featured: Optional[bool] = None
 
-class PostResponse(BaseModel):
+class PostRecord(BaseModel):
+    """A post with its tags and comments, one per line of a bulk export or import"""
+    title: str
+    slug: Optional[str] = None
+    summary: str
+    content: str
+    featured: bool = False
+    view_count: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    tags: List[TagCreate] = []
+    comments: List[CommentRecord] = []
+
+class PostImportResponse(BaseModel):
+    posts: int
+    tags: int
+    comments: int
+
+# Listings return summaries with `view=summary`, which omit the post body
+PostView = Literal["full", "summary"]
+
+class PostSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
     title: str
     slug: str
     summary: str
-    content: str
     view_count: int
     read_time_minutes: int
     featured: bool
@@ -36,3 +57,6 @@ class PostResponse(BaseModel):
     updated_at: datetime
     tags: List[TagResponse] = []
     comment_count: int
+
+class PostResponse(PostSummary):
+    content: str
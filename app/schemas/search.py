@@ -1,9 +1,23 @@
 from pydantic import BaseModel
 
 from app.schemas.pagination import PaginatedResponse
-from app.schemas.posts import PostResponse
+from app.schemas.posts import PostResponse, PostSummary
 from app.schemas.tags import TagResponse
 
 class SearchResponse(BaseModel):
-    posts: PaginatedResponse[PostResponse]
+    posts: PaginatedResponse[PostResponse | PostSummary]
     tags: list[TagResponse]
+
+class PostSuggestion(BaseModel):
+    id: int
+    title: str
+    slug: str
+
+class TagSuggestion(BaseModel):
+    id: int
+    name: str
+    slug: str
+
+class SuggestResponse(BaseModel):
+    posts: list[PostSuggestion]
+    tags: list[TagSuggestion]
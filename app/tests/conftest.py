@@ -31,12 +31,60 @@ def mock_utils(mocker):
     """Automatically mock utils for all tests"""
     mocker.patch("app.routers.posts.slugify", return_value="auto-slug")
     mocker.patch("app.routers.posts.validate_unique_slug", return_value=None)
+    mocker.patch("app.routers.posts.unique_slug", side_effect=lambda slug, model, db: slug)
     mocker.patch("app.routers.tags.slugify", return_value="auto-slug")
     mocker.patch("app.routers.tags.validate_unique_slug", return_value=None)
+    mocker.patch("app.routers.tags.unique_slug", side_effect=lambda slug, model, db: slug)
     mocker.patch("app.routers.posts.calculate_read_time", return_value=5)
 
     yield
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Clear process-wide caches and buffers between tests"""
+    from app.utils import view_cache, view_counter, suggestion_index
+    from app.utils.cache import app_cache, response_cache
+    from app.utils.counters import like_counter
+    view_cache.clear()
+    app_cache.clear()
+    response_cache.clear()
+    view_counter.clear()
+    like_counter.clear()
+    suggestion_index.clear()
+    yield
+
+@pytest.fixture()
+def sqlite_db():
+    """Real session on an in-memory SQLite database for testing SQL helpers"""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.models import Base
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    yield db
+
+    db.close()
+    engine.dispose()
+
+@pytest.fixture()
+def sql_statements(sqlite_db):
+    """
+    Record the SQL statements run on `sqlite_db`.
+
+    Clear the list once the test data is in place to count only the
+    statements the code under test runs.
+    """
+    from sqlalchemy import event
+
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
 @pytest.fixture()
 def mock_auth():
     """Selectively bypass authentication for all tests"""
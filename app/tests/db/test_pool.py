@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.db import database
+from app.db.pool import TimedNullPool, TimedQueuePool, pool_status
+
+def test_timed_queue_pool_records_checkouts():
+    # Arrange
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=2, max_overflow=0)
+
+    # Act
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    status = pool_status(engine)
+
+    # Assert
+    assert status["pool"] == "TimedQueuePool"
+    assert status["checkouts"] == 2
+    assert status["timeouts"] == 0
+    assert status["checked_out"] == 0
+    assert status["max_wait_seconds"] >= 0
+
+def test_timed_queue_pool_records_timeouts():
+    # Arrange
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    held = engine.connect()
+
+    # Act & Assert
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    held.close()
+    status = pool_status(engine)
+    assert status["timeouts"] == 1
+    assert status["max_wait_seconds"] >= 0.05
+
+def test_timed_pool_keeps_metrics_after_dispose():
+    # Arrange
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool)
+    with engine.connect():
+        pass
+
+    # Act
+    engine.dispose()
+
+    # Assert
+    assert pool_status(engine)["checkouts"] == 1
+
+def test_pool_status_without_engine():
+    assert pool_status(None) is None
+
+def test_engine_options_queue_mode(mocker):
+    # Arrange
+    mocker.patch.multiple(database, DB_POOL_MODE="queue", DB_POOL_SIZE=20, DB_MAX_OVERFLOW=5, DB_POOL_RECYCLE=300, DB_POOL_PRE_PING=True, DB_STATEMENT_TIMEOUT=5000, DB_APPLICATION_NAME="blog-api-test")
+
+    # Act
+    options = database.engine_options()
+
+    # Assert
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_recycle"] == 300
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"application_name": "blog-api-test", "options": "-c statement_timeout=5000"}
+
+def test_engine_options_pool_size_override(mocker):
+    # Arrange
+    mocker.patch.multiple(database, DB_POOL_MODE="queue", DB_POOL_SIZE=20, DB_MAX_OVERFLOW=5)
+
+    # Act
+    options = database.engine_options(pool_size=2, max_overflow=0)
+
+    # Assert
+    assert options["pool_size"] == 2
+    assert options["max_overflow"] == 0
+
+def test_engine_options_null_mode_async(mocker):
+    # Arrange
+    mocker.patch.multiple(database, DB_POOL_MODE="null", DB_STATEMENT_TIMEOUT=0, DB_APPLICATION_NAME="blog-api")
+
+    # Act
+    options = database.engine_options(async_driver=True)
+
+    # Assert
+    assert options["poolclass"] is TimedNullPool
+    assert "pool_size" not in options
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+    assert options["connect_args"]["server_settings"] == {"application_name": "blog-api"}
+    assert options["connect_args"]["prepared_statement_name_func"]() != options["connect_args"]["prepared_statement_name_func"]()
+
+def test_engine_options_null_mode_rejects_statement_timeout(mocker):
+    # Arrange
+    mocker.patch.multiple(database, DB_POOL_MODE="null", DB_STATEMENT_TIMEOUT=5000)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="statement_timeout"):
+        database.engine_options()
+
+def test_engine_options_unknown_mode(mocker):
+    # Arrange
+    mocker.patch.object(database, "DB_POOL_MODE", "session")
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        database.engine_options()
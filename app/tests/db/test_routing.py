@@ -0,0 +1,166 @@
+import inspect
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.db import DatabaseRouter, get_db, get_async_db
+from app.db.database import get_async_database_url
+from app.db.routing import run_in_async_session
+from app.schemas import TagResponse
+from app.tests.utils import create_mock_tag
+
+class FakeAsyncSession:
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+        self.run_sync_calls = 0
+
+    async def run_sync(self, fn, *args, **kwargs):
+        self.run_sync_calls += 1
+        return fn(self.sync_session, *args, **kwargs)
+
+def build_client(mocker, sync_session):
+    mocker.patch("app.db.database.DATABASE_MODE", "async")
+    router = DatabaseRouter(prefix="/items")
+
+    @router.get("/{item_id}", response_model=TagResponse)
+    def get_item(item_id: int, db: Session = Depends(get_db)):
+        item = db.get(item_id)
+        if item is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return item
+
+    app = FastAPI()
+    app.include_router(router)
+    async_session = FakeAsyncSession(sync_session)
+    app.dependency_overrides[get_async_db] = lambda: async_session
+    return TestClient(app), async_session
+
+def test_run_in_async_session_swaps_dependency():
+    # Arrange
+    def endpoint(item_id: int, db: Session = Depends(get_db)):
+        return item_id
+
+    # Act
+    wrapped = run_in_async_session(endpoint)
+
+    # Assert
+    assert inspect.iscoroutinefunction(wrapped)
+    parameters = inspect.signature(wrapped).parameters
+    assert parameters["db"].default.dependency is get_async_db
+    assert list(parameters) == ["item_id", "db"]
+
+def test_run_in_async_session_skips_endpoints_without_db():
+    # Arrange
+    def endpoint(item_id: int):
+        return item_id
+
+    # Act & Assert
+    assert run_in_async_session(endpoint) is endpoint
+
+def test_database_router_async_mode(mocker):
+    # Arrange
+    sync_session = mocker.MagicMock()
+    sync_session.get.return_value = create_mock_tag(1, "Python", "python")
+    client, async_session = build_client(mocker, sync_session)
+
+    # Act
+    response = client.get("/items/1")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["name"] == "Python"
+    assert async_session.run_sync_calls == 1
+    sync_session.get.assert_called_once_with(1)
+
+def test_database_router_async_mode_propagates_http_errors(mocker):
+    # Arrange
+    sync_session = mocker.MagicMock()
+    sync_session.get.return_value = None
+    client, _ = build_client(mocker, sync_session)
+
+    # Act
+    response = client.get("/items/2")
+
+    # Assert
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Item not found"
+
+def test_database_router_sync_mode_keeps_endpoint(mocker):
+    # Arrange
+    mocker.patch("app.db.database.DATABASE_MODE", "sync")
+    router = DatabaseRouter()
+
+    @router.get("/")
+    def endpoint(db: Session = Depends(get_db)):
+        return None
+
+    # Act & Assert
+    assert router.routes[0].endpoint is endpoint
+
+def build_fast_json_client(mocker, mode="sync", fast_json=True):
+    mocker.patch("app.db.database.DATABASE_MODE", mode)
+    mocker.patch("app.db.routing.FAST_JSON", fast_json)
+    router = DatabaseRouter(prefix="/items")
+
+    def set_header(response: Response):
+        response.headers["X-Version"] = "1"
+
+    @router.get("/", response_model=list[TagResponse], dependencies=[Depends(set_header)])
+    def list_items(db: Session = Depends(get_db)):
+        return db.all()
+
+    @router.post("/", response_model=TagResponse, status_code=201)
+    def create_item(db: Session = Depends(get_db)):
+        return db.all()[0]
+
+    sync_session = mocker.MagicMock()
+    sync_session.all.return_value = [create_mock_tag(1, "Python", "python"), create_mock_tag(2, "Go", "go")]
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: sync_session
+    app.dependency_overrides[get_async_db] = lambda: FakeAsyncSession(sync_session)
+    return TestClient(app)
+
+def test_database_router_fast_json(mocker):
+    # Arrange
+    client = build_fast_json_client(mocker)
+
+    # Act
+    listed = client.get("/items/")
+    created = client.post("/items/")
+
+    # Assert
+    assert listed.status_code == 200
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.headers["x-version"] == "1"
+    assert [item["name"] for item in listed.json()] == ["Python", "Go"]
+    assert listed.json()[0]["created_at"] == "2026-01-01T00:00:00"
+    assert created.status_code == 201
+    assert created.json()["slug"] == "python"
+
+def test_database_router_fast_json_async_mode(mocker):
+    # Arrange
+    client = build_fast_json_client(mocker, mode="async")
+
+    # Act
+    response = client.get("/items/")
+
+    # Assert
+    assert response.status_code == 200
+    assert [item["slug"] for item in response.json()] == ["python", "go"]
+
+def test_database_router_fast_json_matches_default_output(mocker):
+    # Arrange
+    fast = build_fast_json_client(mocker)
+    default = build_fast_json_client(mocker, fast_json=False)
+
+    # Act
+    fast_response = fast.get("/items/")
+    default_response = default.get("/items/")
+
+    # Assert
+    assert fast_response.json() == default_response.json()
+
+def test_get_async_database_url():
+    assert get_async_database_url("postgresql://u:p@db:5432/blog") == "postgresql+asyncpg://u:p@db:5432/blog"
+    assert get_async_database_url("postgresql+psycopg2://u:p@db/blog") == "postgresql+asyncpg://u:p@db/blog"
+    assert get_async_database_url("sqlite:///blog.db") == "sqlite:///blog.db"
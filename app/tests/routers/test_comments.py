@@ -1,14 +1,17 @@
 from datetime import datetime
 from fastapi.testclient import TestClient
+from app.db.database import get_db
 from app.main import app
+from app.models import Comment, Post
 from app.tests.utils import create_mock_refresh, create_mock_comment, create_mock_post
+from app.utils.counters import like_counter
 
 client = TestClient(app)
 
 def test_get_comment(mock_db):
     # Arrange
     mock_comment = create_mock_comment(1, 1, "John Doe", "Great post!")
-    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_comment
+    mock_db.query.return_value.filter.return_value.first.return_value = mock_comment
 
     # Act
     response = client.get("/comments/1")
@@ -25,7 +28,7 @@ def test_get_comment(mock_db):
 
 def test_get_comment_not_found(mock_db):
     # Arrange
-    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = None
+    mock_db.query.return_value.filter.return_value.first.return_value = None
 
     # Act
     response = client.get("/comments/99999")
@@ -38,8 +41,8 @@ def test_get_comments_by_post(mock_db):
     # Arrange
     mock_comment1 = create_mock_comment(1, 1, "John Doe", "Great post!")
     mock_comment2 = create_mock_comment(2, 1, "Jane Smith", "I agree!")
-    mock_db.query.return_value.options.return_value.filter.return_value.count.return_value = 2
-    mock_db.query.return_value.options.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [
+    mock_db.query.return_value.filter.return_value.count.return_value = 2
+    mock_db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [
         mock_comment1,
         mock_comment2
     ]
@@ -52,10 +55,26 @@ def test_get_comments_by_post(mock_db):
     assert response.status_code == 200
 
 
+def test_get_comments_by_post_revalidated_after_like(mock_db):
+    # Arrange
+    mock_comment = create_mock_comment(1, 1, "John Doe", "Great post!")
+    mock_db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = [mock_comment]
+    mock_db.scalars.return_value.first.return_value = mock_comment
+    etag = client.get("/comments/post/1").headers["etag"]
+    cached = client.get("/comments/post/1", headers={"If-None-Match": etag})
+
+    # Act
+    client.post("/comments/1/like")
+    changed = client.get("/comments/post/1", headers={"If-None-Match": etag})
+
+    # Assert
+    assert cached.status_code == 304
+    assert changed.status_code == 200
+
 def test_get_comments_by_post_with_pagination(mock_db):
     # Arrange
-    mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.count.return_value = 0
-    mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+    mock_db.query.return_value.filter.return_value.order_by.return_value.count.return_value = 0
+    mock_db.query.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
 
     # Act
     response = client.get("/comments/post/1?offset=10&limit=5")
@@ -67,8 +86,8 @@ def test_get_comments_by_post_with_pagination(mock_db):
     assert data["offset"] == 10
     assert data["limit"] == 5
     assert data["items"] == []
-    mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.assert_called_with(10)
-    mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.assert_called_with(5)
+    mock_db.query.return_value.filter.return_value.order_by.return_value.offset.assert_called_with(10)
+    mock_db.query.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.assert_called_with(5)
 
 def test_create_comment(mock_db):
     # Arrange
@@ -102,6 +121,8 @@ def test_create_comment(mock_db):
     assert data["content"] == "Great post!"
     assert data["parent_id"] is None
     mock_db.add.assert_called_once()
+    mock_db.execute.assert_called_once()
+    assert "comment_count=(posts.comment_count +" in str(mock_db.execute.call_args.args[0])
     mock_db.commit.assert_called_once()
     mock_db.refresh.assert_called_once()
 
@@ -153,6 +174,7 @@ def test_create_comment_with_parent(mock_db):
     assert response.status_code == 201
     assert data["parent_id"] == 1
     mock_db.add.assert_called_once()
+    assert mock_db.add.call_args.args[0].root_id == 1
     mock_db.commit.assert_called_once()
 
 def test_create_comment_parent_not_found(mock_db):
@@ -196,10 +218,61 @@ def test_create_comment_parent_wrong_post(mock_db):
     assert response.status_code == 400
     assert response.json()["detail"] == "Parent comment does not belong to the specified post"
 
+def test_like_comment_single_statement(sqlite_db, sql_statements):
+    # Arrange
+    sqlite_db.add(Post(title="Post", slug="post", summary="Summary", content="Content", read_time_minutes=1))
+    sqlite_db.add(Comment(post_id=1, author_name="Reader", content="Nice", like_count=4))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    sql_statements.clear()
+
+    # Act
+    liked = client.post("/comments/1/like")
+    repeated = client.post("/comments/1/like")
+
+    # Assert
+    assert liked.status_code == 200
+    assert liked.json()["like_count"] == 5
+    assert liked.json()["replies"] == []
+    assert repeated.json()["like_count"] == 5
+    assert sql_statements[0].startswith("UPDATE comments SET like_count=(comments.like_count + ?)")
+    assert "RETURNING" in sql_statements[0]
+    assert sum(statement.startswith("UPDATE") for statement in sql_statements) == 1
+
+def test_dislike_comment_not_found(mock_db):
+    # Arrange
+    mock_db.scalars.return_value.first.return_value = None
+
+    # Act
+    response = client.post("/comments/999/dislike")
+
+    # Assert
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Comment not found"
+    mock_db.commit.assert_not_called()
+
+def test_like_comment_buffered(mock_db, mocker):
+    # Arrange
+    mocker.patch("app.routers.comments.REACTION_BUFFERING", True)
+    mock_comment = create_mock_comment(1, 1, "John Doe", "Great post!")
+    mock_comment.like_count = 3
+    mock_db.query.return_value.filter.return_value.first.return_value = mock_comment
+
+    # Act
+    response = client.post("/comments/1/dislike")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["like_count"] == 2
+    assert like_counter.pending(1) == -1
+    mock_db.scalars.assert_not_called()
+    mock_db.commit.assert_not_called()
+
 def test_delete_comment(mock_db, mock_auth):
     # Arrange
     mock_comment = create_mock_comment(1, 1, "John Doe", "Great post!")
     mock_db.query.return_value.filter.return_value.first.return_value = mock_comment
+    mock_db.execute.return_value.scalar_one.return_value = 3
 
     # Act
     response = client.delete("/comments/1")
@@ -207,6 +280,8 @@ def test_delete_comment(mock_db, mock_auth):
     # Assert
     assert response.status_code == 204
     mock_db.delete.assert_called_once_with(mock_comment)
+    update_stmt = mock_db.execute.call_args_list[-1].args[0]
+    assert update_stmt.compile().params["comment_count_1"] == -3
     mock_db.commit.assert_called_once()
 
 def test_delete_comment_not_found(mock_db, mock_auth):
@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_get_metrics(mock_auth):
+    # Act
+    response = client.get("/metrics/")
+    data = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert data["caches"]["view_cache"]["backend"] == "MemoryCacheBackend"
+    assert "hits" in data["caches"]["view_cache"]
+    assert "evictions" in data["caches"]["view_cache"]
+    assert data["caches"]["response_cache"]["maxsize"] == 1000
+    assert data["pools"]["sync"]["pool"] == "TimedQueuePool"
+    assert "avg_wait_seconds" in data["pools"]["sync"]
+    assert data["pools"]["async"] is None
+
+def test_get_metrics_unauthorized():
+    # Act
+    response = client.get("/metrics/")
+
+    # Assert
+    assert response.status_code == 401
@@ -1,7 +1,12 @@
+import json
 from datetime import datetime
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from app.db.database import get_db
 from app.main import app
+from app.models import Post, Tag
 from app.tests.utils import create_mock_refresh, create_mock_post, create_mock_tag
+from app.utils import invalidate, view_cache
 
 client = TestClient(app)
 
@@ -27,6 +32,25 @@ def test_get_posts(mock_db):
     assert data["items"][0]["content"] == "Content"
     assert data["items"][0]["tags"] == []
 
+def test_get_posts_summary_view(sqlite_db, sql_statements):
+    # Arrange
+    for i in range(3):
+        sqlite_db.add(Post(title=f"Post {i}", slug=f"post-{i}", summary="Summary", content="Body " * 1000, read_time_minutes=5))
+    sqlite_db.commit()
+    sqlite_db.expunge_all()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    sql_statements.clear()
+
+    # Act
+    response = client.get("/posts/?view=summary&cursor=")
+    data = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert len(data["items"]) == 3
+    assert all("content" not in item and item["summary"] == "Summary" for item in data["items"])
+    assert not any("posts.content" in statement for statement in sql_statements)
+
 def test_get_posts_with_pagination(mock_db):
     # Arrange
     mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.count.return_value = 0
@@ -45,6 +69,105 @@ def test_get_posts_with_pagination(mock_db):
     mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.assert_called_with(10)
     mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.assert_called_with(5)
 
+def test_get_posts_caches_total_until_post_write(mock_db, mock_auth):
+    # Arrange
+    query = mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value
+    query.count.return_value = 3
+    query.offset.return_value.limit.return_value.all.return_value = []
+    mock_db.refresh.side_effect = create_mock_refresh(
+        id=1,
+        view_count=0,
+        comment_count=0,
+        created_at=datetime(2026, 1, 1),
+        updated_at=datetime(2026, 1, 1)
+    )
+
+    # Act
+    client.get("/posts/")
+    client.get("/posts/?offset=10")
+    count_calls_before_write = query.count.call_count
+    client.post("/posts/", json={"title": "New Post", "summary": "Post summary", "content": "Post content"})
+    client.get("/posts/")
+
+    # Assert
+    assert count_calls_before_write == 1
+    assert query.count.call_count == 2
+
+def test_get_posts_with_cursor(mock_db):
+    # Arrange
+    mock_posts = [create_mock_post(i, f"Post {i}", f"post-{i}", "Content", created_at=datetime(2026, 1, 10 - i)) for i in range(1, 4)]
+    query = mock_db.query.return_value.options.return_value.filter.return_value.order_by.return_value
+    query.limit.return_value.all.return_value = mock_posts
+
+    # Act
+    response = client.get("/posts/?cursor=&limit=2")
+    data = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert len(data["items"]) == 2
+    assert data["total"] is None
+    assert data["next_cursor"] is not None
+    query.limit.assert_called_with(3)
+    query.offset.assert_not_called()
+
+def test_get_posts_with_invalid_cursor(mock_db):
+    # Act
+    response = client.get("/posts/?cursor=bogus")
+
+    # Assert
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_get_featured_post_summary_view(mock_db):
+    # Arrange
+    mock_post = create_mock_post(1, "Test", "test-slug", "Content", featured=True)
+    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+    mock_db.query.return_value.options.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+
+    # Act
+    full = client.get("/posts/featured")
+    summary = client.get("/posts/featured?view=summary")
+
+    # Assert
+    assert summary.status_code == 200
+    assert "content" not in summary.json()
+    assert summary.json()["slug"] == "test-slug"
+    assert summary.headers["etag"] != full.headers["etag"]
+
+def test_get_featured_post_caches_featured_id(sqlite_db, sql_statements):
+    # Arrange
+    sqlite_db.add_all([
+        Post(title="Featured", slug="featured", summary="Summary", content="Content", read_time_minutes=1, featured=True),
+        Post(title="Other", slug="other", summary="Summary", content="Content", read_time_minutes=1)
+    ])
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    sql_statements.clear()
+
+    # Act
+    full = client.get("/posts/featured")
+    summary = client.get("/posts/featured?view=summary")
+
+    # Assert
+    assert full.json()["slug"] == summary.json()["slug"] == "featured"
+    assert sum("WHERE posts.featured = 1" in statement for statement in sql_statements) == 1
+
+def test_get_featured_post_caches_missing_featured_post(sqlite_db, sql_statements):
+    # Arrange
+    sqlite_db.add(Post(title="Other", slug="other", summary="Summary", content="Content", read_time_minutes=1))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    sql_statements.clear()
+
+    # Act
+    full = client.get("/posts/featured")
+    summary = client.get("/posts/featured?view=summary")
+
+    # Assert
+    assert full.status_code == summary.status_code == 404
+    assert sum("WHERE posts.featured = 1" in statement for statement in sql_statements) == 1
+
 def test_get_post_by_id(mock_db):
     # Arrange
     mock_post = create_mock_post(1, "Test", "test-slug", "Content")
@@ -72,6 +195,58 @@ def test_get_post_by_id_not_found(mock_db):
     # Assert
     assert response.status_code == 404
 
+def test_get_post_by_id_not_modified(mock_db):
+    # Arrange
+    mock_post = create_mock_post(1, "Test", "test-slug", "Content")
+    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+    first = client.get("/posts/1")
+    mock_db.query.reset_mock()
+
+    # Act
+    response = client.get("/posts/1", headers={"If-None-Match": first.headers["etag"]})
+
+    # Assert
+    assert first.headers["etag"].startswith('W/"')
+    assert first.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=300"
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == first.headers["etag"]
+    mock_db.query.assert_not_called()
+
+def test_get_post_by_id_revalidated_after_write(mock_db):
+    # Arrange
+    mock_post = create_mock_post(1, "Test", "test-slug", "Content")
+    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+    etag = client.get("/posts/1").headers["etag"]
+
+    # Act
+    invalidate("post:2")
+    unrelated = client.get("/posts/1", headers={"If-None-Match": etag})
+    invalidate("post:1")
+    changed = client.get("/posts/1", headers={"If-None-Match": etag})
+
+    # Assert
+    assert unrelated.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+def test_get_post_by_id_cached_until_update(mock_db, mock_auth):
+    # Arrange
+    mock_post = create_mock_post(1, "Test", "test-slug", "Content")
+    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+    mock_db.query.return_value.filter.return_value.first.return_value = mock_post
+    client.get("/posts/1")
+    cached = client.get("/posts/1")
+
+    # Act
+    client.patch("/posts/1", json={"title": "Updated Title"})
+    updated = client.get("/posts/1")
+
+    # Assert
+    assert cached.json()["title"] == "Test"
+    assert updated.json()["title"] == "Updated Title"
+    assert mock_db.query.return_value.options.call_count == 2
+
 def test_get_post_by_slug(mock_db):
     # Arrange
     mock_post = create_mock_post(1, "Test", "test-slug", "Content")
@@ -89,6 +264,36 @@ def test_get_post_by_slug(mock_db):
     assert data["content"] == "Content"
     assert data["tags"] == []
 
+def test_get_post_by_slug_buffers_view_count(mock_db):
+    # Arrange
+    mock_post = create_mock_post(1, "Test", "test-slug", "Content", view_count=5)
+    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+
+    # Act
+    first = client.get("/posts/slug/test-slug").json()
+    second = client.get("/posts/slug/test-slug").json()
+
+    # Assert
+    assert first["view_count"] == 6
+    assert second["view_count"] == 6
+    assert mock_post.view_count == 5
+    mock_db.commit.assert_not_called()
+
+def test_get_post_by_slug_counts_views_on_cached_lookup(mock_db):
+    # Arrange
+    mock_post = create_mock_post(1, "Test", "test-slug", "Content", view_count=5)
+    mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_post
+
+    # Act
+    first = client.get("/posts/slug/test-slug")
+    view_cache.clear()
+    second = client.get("/posts/slug/test-slug")
+
+    # Assert
+    assert mock_db.query.call_count == 1
+    assert first.json()["view_count"] == 6
+    assert second.json()["view_count"] == 7
+
 def test_get_post_by_slug_not_found(mock_db):
     # Arrange
     mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = None
@@ -221,6 +426,39 @@ def test_update_post(mock_db, mock_auth):
     mock_db.commit.assert_called_once()
     mock_db.refresh.assert_called_once_with(mock_post)
 
+def test_update_post_swaps_featured_post(sqlite_db, mock_auth):
+    # Arrange
+    sqlite_db.add_all([
+        Post(title="First", slug="first", summary="Summary", content="Content", read_time_minutes=1, featured=True),
+        Post(title="Second", slug="second", summary="Summary", content="Content", read_time_minutes=1)
+    ])
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    assert client.get("/posts/featured").json()["slug"] == "first"
+
+    # Act
+    response = client.patch("/posts/2", json={"featured": True})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["featured"] is True
+    assert [post.slug for post in sqlite_db.query(Post).filter(Post.featured == True)] == ["second"]
+    assert client.get("/posts/featured").json()["slug"] == "second"
+
+def test_update_post_featured_conflict(mock_db, mock_auth):
+    # Arrange
+    mock_post = create_mock_post(1, "Title", "slug", "Content")
+    mock_db.query.return_value.filter.return_value.first.return_value = mock_post
+    mock_db.commit.side_effect = IntegrityError("UPDATE posts", {}, Exception("ix_posts_featured_unique"))
+
+    # Act
+    response = client.patch("/posts/1", json={"featured": True})
+
+    # Assert
+    assert response.status_code == 409
+    mock_db.rollback.assert_called_once()
+    mock_db.refresh.assert_not_called()
+
 def test_update_post_not_found(mock_db, mock_auth):
     # Arrange
     mock_db.query.return_value.filter.return_value.first.return_value = None
@@ -328,4 +566,137 @@ def test_delete_post_unauthorized(mock_db):
     response = client.delete("/posts/1")
 
     # Assert
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def test_import_and_export_posts_round_trip(sqlite_db, mock_auth, mocker):
+    # Arrange
+    sqlite_db.add(Tag(name="Python", slug="python"))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    mocker.patch("app.routers.posts.SessionLocal", return_value=sqlite_db)
+    records = [
+        {
+            "title": "First", "slug": "first", "summary": "Summary", "content": "Some words", "featured": True, "view_count": 7,
+            "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-02T00:00:00",
+            "tags": [{"name": "Python", "slug": "python"}, {"name": "Testing", "slug": "testing"}],
+            "comments": [
+                {"id": 10, "parent_id": None, "author_name": "Reader", "content": "Root", "like_count": 2, "created_at": "2026-01-03T00:00:00"},
+                {"id": 11, "parent_id": 10, "author_name": "Author", "content": "Reply", "like_count": 0, "created_at": "2026-01-04T00:00:00"},
+                {"id": 12, "parent_id": 11, "author_name": "Reader", "content": "Nested", "like_count": 1, "created_at": "2026-01-05T00:00:00"}
+            ]
+        },
+        {
+            "title": "Second", "slug": "second", "summary": "Summary", "content": "More words", "featured": False, "view_count": 0,
+            "created_at": "2026-02-01T00:00:00", "updated_at": "2026-02-01T00:00:00", "tags": [], "comments": []
+        }
+    ]
+
+    # Act
+    imported = client.post("/posts/bulk", content="\n".join(json.dumps(record) for record in records), headers={"Content-Type": "application/x-ndjson"})
+    exported = client.get("/posts/export")
+    lines = [json.loads(line) for line in exported.text.splitlines()]
+
+    # Assert
+    assert imported.status_code == 201
+    assert imported.json() == {"posts": 2, "tags": 1, "comments": 3}
+    assert exported.headers["content-type"] == "application/x-ndjson"
+    # Comments get new ids, so compare them with ids mapped back to the source
+    comments = lines[0].pop("comments")
+    source_ids = {comment["id"]: source["id"] for comment, source in zip(comments, records[0]["comments"])}
+    assert [{**comment, "id": source_ids[comment["id"]], "parent_id": source_ids.get(comment["parent_id"])} for comment in comments] == records[0]["comments"]
+    assert lines[0] == {key: value for key, value in records[0].items() if key != "comments"}
+    assert lines[1] == records[1]
+    assert client.get("/posts/slug/first").json()["comment_count"] == 3
+    assert client.get("/posts/featured").json()["slug"] == "first"
+
+def test_import_posts_rejects_taken_slugs(sqlite_db, mock_auth):
+    # Arrange
+    sqlite_db.add(Post(title="Existing", slug="existing", summary="Summary", content="Content", read_time_minutes=1))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    records = [{"title": "Existing", "slug": "existing", "summary": "Summary", "content": "Content"}, {"title": "New", "slug": "new", "summary": "Summary", "content": "Content"}]
+
+    # Act
+    response = client.post("/posts/bulk", json=records)
+
+    # Assert
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Post with this slug already exists: existing"
+    assert sqlite_db.query(Post).count() == 1
+
+def test_import_posts_suffixes_derived_slugs(sqlite_db, mock_auth):
+    # Arrange
+    sqlite_db.add(Post(title="Same Title", slug="same-title", summary="Summary", content="Content", read_time_minutes=1))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    records = [
+        {"title": "Same Title", "summary": "Summary", "content": "Content"},
+        {"title": "Other", "slug": "same-title-2", "summary": "Summary", "content": "Content"},
+        {"title": "Same Title", "summary": "Summary", "content": "Content"}
+    ]
+
+    # Act
+    response = client.post("/posts/bulk", json=records)
+
+    # Assert
+    assert response.status_code == 201
+    assert [slug for slug, in sqlite_db.query(Post.slug).order_by(Post.id)] == ["same-title", "same-title-3", "same-title-2", "same-title-4"]
+
+def test_import_posts_rejects_tag_name_under_two_slugs(sqlite_db, mock_auth):
+    # Arrange
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    records = [
+        {"title": "One", "summary": "Summary", "content": "Content", "tags": [{"name": "Py", "slug": "py"}]},
+        {"title": "Two", "summary": "Summary", "content": "Content", "tags": [{"name": "Py", "slug": "python"}]}
+    ]
+
+    # Act
+    response = client.post("/posts/bulk", json=records)
+
+    # Assert
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Tag names used with different slugs in import: Py"
+    assert sqlite_db.query(Tag).count() == 0
+    assert sqlite_db.query(Post).count() == 0
+
+def test_import_posts_conflict_during_insert(sqlite_db, mock_auth, mocker):
+    # Arrange
+    sqlite_db.add(Post(title="Taken", slug="taken", summary="Summary", content="Content", read_time_minutes=1))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    # A concurrent import takes the slug between the check and the insert
+    mocker.patch("app.utils.bulk_posts.validate_unique_slugs", return_value=None)
+    records = [{"title": "Taken", "slug": "taken", "summary": "Summary", "content": "Content", "tags": [{"name": "New"}]}]
+
+    # Act
+    response = client.post("/posts/bulk", json=records)
+
+    # Assert
+    assert response.status_code == 409
+    assert sqlite_db.query(Post).count() == 1
+
+def test_import_posts_validation_error_locates_record(mock_db, mock_auth):
+    # Act
+    response = client.post("/posts/bulk", content='{"title": "Ok", "summary": "S", "content": "C"}\n\n{"summary": "S", "content": "C"}\n', headers={"Content-Type": "application/x-ndjson"})
+
+    # Assert
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "title"]
+    mock_db.commit.assert_not_called()
+
+def test_import_posts_documents_request_body():
+    # Act
+    operation = client.get("/openapi.json").json()["paths"]["/posts/bulk"]["post"]
+
+    # Assert
+    content = operation["requestBody"]["content"]
+    assert content["application/x-ndjson"]["schema"]["properties"]["comments"]["items"]["properties"]["parent_id"]
+    assert content["application/json"]["schema"]["type"] == "array"
+    assert "$ref" not in str(content)
+
+def test_export_posts_unauthorized(mock_db):
+    # Act
+    response = client.get("/posts/export")
+
+    # Assert
+    assert response.status_code == 401
@@ -1,3 +1,4 @@
+from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 from app.main import app
 from app.tests.utils import create_mock_post, create_mock_tag
@@ -6,15 +7,14 @@ client = TestClient(app)
 
 def test_autocomplete_search_posts_and_tags(mock_db):
     # Arrange
-    from unittest.mock import MagicMock
     
     mock_post1 = create_mock_post(1, "Python Tutorial", "python-tutorial", "Learn Python programming")
     mock_post2 = create_mock_post(2, "Advanced Python", "advanced-python", "Deep dive into Python")
     mock_tag1 = create_mock_tag(1, "Python", "python")
 
     posts_query = MagicMock()
-    posts_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_post1, mock_post2]
-    posts_query.filter.return_value.order_by.return_value.count.return_value = 2
+    posts_query.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_post1, mock_post2]
+    posts_query.options.return_value.filter.return_value.order_by.return_value.count.return_value = 2
     
     tags_query = MagicMock()
     tags_query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [mock_tag1]
@@ -39,11 +39,10 @@ def test_autocomplete_search_posts_and_tags(mock_db):
 
 def test_autocomplete_search_no_results(mock_db):
     # Arrange
-    from unittest.mock import MagicMock
     
     posts_mock = MagicMock()
-    posts_mock.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
-    posts_mock.filter.return_value.order_by.return_value.count.return_value = 0
+    posts_mock.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+    posts_mock.options.return_value.filter.return_value.order_by.return_value.count.return_value = 0
     
     tags_mock = MagicMock()
     tags_mock.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
@@ -59,15 +58,37 @@ def test_autocomplete_search_no_results(mock_db):
     assert data["posts"]["items"] == []
     assert data["tags"] == []
 
+def test_autocomplete_search_summary_view(mock_db):
+    # Arrange
+
+    mock_post = create_mock_post(1, "Python Tutorial", "python-tutorial", "Learn Python programming")
+    posts_mock = MagicMock()
+    posts_mock.options.return_value.filter.return_value.options.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_post]
+    posts_mock.options.return_value.filter.return_value.options.return_value.order_by.return_value.count.return_value = 1
+
+    tags_mock = MagicMock()
+    tags_mock.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
+
+    mock_db.query.side_effect = [posts_mock, tags_mock]
+
+    # Act
+    response = client.get("/search/autocomplete?q=python&view=summary")
+    data = response.json()
+
+    # Assert
+    assert response.status_code == 200
+    assert data["posts"]["items"][0]["slug"] == "python-tutorial"
+    assert "content" not in data["posts"]["items"][0]
+    posts_mock.options.return_value.filter.return_value.options.assert_called_once()
+
 def test_autocomplete_search_posts_only(mock_db):
     # Arrange
-    from unittest.mock import MagicMock
     
     mock_post = create_mock_post(1, "JavaScript Basics", "javascript-basics", "Learn JS")
 
     posts_query = MagicMock()
-    posts_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_post]
-    posts_query.filter.return_value.order_by.return_value.count.return_value = 1
+    posts_query.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [mock_post]
+    posts_query.options.return_value.filter.return_value.order_by.return_value.count.return_value = 1
     
     tags_query = MagicMock()
     tags_query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
@@ -94,11 +115,10 @@ def test_autocomplete_search_tags_only(mock_db):
     # Arrange
     mock_tag = create_mock_tag(1, "React", "react")
 
-    from unittest.mock import MagicMock
     
     posts_mock = MagicMock()
-    posts_mock.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
-    posts_mock.filter.return_value.order_by.return_value.count.return_value = 0
+    posts_mock.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+    posts_mock.options.return_value.filter.return_value.order_by.return_value.count.return_value = 0
     
     tags_mock = MagicMock()
     tags_mock.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [mock_tag]
@@ -132,14 +152,13 @@ def test_autocomplete_search_empty_query(mock_db):
 
 def test_autocomplete_search_limit_enforced(mock_db):
     # Arrange
-    from unittest.mock import MagicMock
     
     mock_posts = [create_mock_post(i, f"Post {i}", f"post-{i}", f"Content {i}") for i in range(1, 16)]
     mock_tags = [create_mock_tag(i, f"Tag {i}", f"tag-{i}") for i in range(1, 16)]
 
     posts_query = MagicMock()
-    posts_query.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_posts[:10]
-    posts_query.filter.return_value.order_by.return_value.count.return_value = 15
+    posts_query.options.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_posts[:10]
+    posts_query.options.return_value.filter.return_value.order_by.return_value.count.return_value = 15
     
     tags_query = MagicMock()
     tags_query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = mock_tags[:5]
@@ -159,3 +178,23 @@ def test_autocomplete_search_limit_enforced(mock_db):
     assert response.status_code == 200
     assert len(data["posts"]["items"]) == 10
     assert len(data["tags"]) == 5
+
+def test_suggest(mock_db):
+    # Arrange
+    mock_db.query.side_effect = [
+        [(1, "Python Tutorial", "python-tutorial", 10), (2, "Rust Tutorial", "rust-tutorial", 20)],
+        [(1, "Python", "python")]
+    ]
+
+    # Act
+    response = client.get("/search/suggest?q=pyt")
+    repeat = client.get("/search/suggest?q=tut&limit=1")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {
+        "posts": [{"id": 1, "title": "Python Tutorial", "slug": "python-tutorial"}],
+        "tags": [{"id": 1, "name": "Python", "slug": "python"}]
+    }
+    assert repeat.json()["posts"] == [{"id": 2, "title": "Rust Tutorial", "slug": "rust-tutorial"}]
+    assert mock_db.query.call_count == 2
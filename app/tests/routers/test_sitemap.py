@@ -0,0 +1,219 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from app.db.database import get_db
+from app.main import app
+from app.models import Post, Tag
+from app.tests.utils import create_mock_post, create_mock_tag
+from app.utils import invalidate
+
+client = TestClient(app)
+
+def mock_feed_queries(mock_db):
+    mock_post = create_mock_post(1, "Test Post", "test-post", "Content", updated_at=datetime(2026, 2, 1, 12, 30))
+    mock_tag = create_mock_tag(1, "Python", "python", updated_at=datetime(2026, 1, 15))
+
+    def query(*columns):
+        rows = [mock_post] if columns[0].class_ is Post else [mock_tag]
+        result = MagicMock()
+        result.all.return_value = rows
+        result.order_by.return_value.all.return_value = rows
+        return result
+
+    mock_db.query.side_effect = query
+
+def test_get_sitemap(mock_db):
+    # Arrange
+    mock_feed_queries(mock_db)
+
+    # Act
+    response = client.get("/sitemap.xml")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/xml"
+    assert b"https://blog.jacobarthurs.com/post/test-post" in response.content
+    assert b"https://blog.jacobarthurs.com/tag/python" in response.content
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"] == "Sun, 01 Feb 2026 12:30:00 GMT"
+    assert response.headers["cache-control"] == "public, max-age=300"
+
+def test_get_sitemap_is_cached(mock_db):
+    # Arrange
+    mock_feed_queries(mock_db)
+    first = client.get("/sitemap.xml")
+    mock_db.query.reset_mock()
+
+    # Act
+    second = client.get("/sitemap.xml")
+
+    # Assert
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    mock_db.query.assert_not_called()
+
+def test_get_sitemap_regenerated_after_invalidation(mock_db):
+    # Arrange
+    mock_feed_queries(mock_db)
+    client.get("/sitemap.xml")
+    mock_db.query.reset_mock()
+
+    # Act
+    invalidate("tag-list")
+    response = client.get("/sitemap.xml")
+
+    # Assert
+    assert response.status_code == 200
+    assert mock_db.query.call_count == 2
+
+def test_get_sitemap_if_none_match(mock_db):
+    # Arrange
+    mock_feed_queries(mock_db)
+    etag = client.get("/sitemap.xml").headers["etag"]
+
+    # Act
+    response = client.get("/sitemap.xml", headers={"If-None-Match": f'"other", W/{etag}'})
+
+    # Assert
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+def test_get_sitemap_if_none_match_changed(mock_db):
+    # Arrange
+    mock_feed_queries(mock_db)
+
+    # Act
+    response = client.get("/sitemap.xml", headers={"If-None-Match": '"stale"', "If-Modified-Since": "Sun, 01 Feb 2026 12:30:00 GMT"})
+
+    # Assert
+    assert response.status_code == 200
+
+def test_get_rss_feed_if_modified_since(mock_db):
+    # Arrange
+    mock_feed_queries(mock_db)
+
+    # Act
+    current = client.get("/rss.xml", headers={"If-Modified-Since": "Sun, 01 Feb 2026 12:30:00 GMT"})
+    outdated = client.get("/rss.xml", headers={"If-Modified-Since": "Sun, 01 Feb 2026 12:29:59 GMT"})
+    invalid = client.get("/rss.xml", headers={"If-Modified-Since": "yesterday"})
+
+    # Assert
+    assert current.status_code == 304
+    assert outdated.status_code == 200
+    assert b"<title>Test Post</title>" in outdated.content
+    assert invalid.status_code == 200
+
+def seed_sitemap(sqlite_db, mocker, posts=5):
+    for i in range(posts):
+        sqlite_db.add(Post(title=f"Post {i}", slug=f"post-{i}", summary="S", content="C", read_time_minutes=1, updated_at=datetime(2026, 1, i + 1)))
+    sqlite_db.add(Tag(name="R&D", slug="r&d", updated_at=datetime(2026, 3, 1)))
+    sqlite_db.commit()
+    app.dependency_overrides[get_db] = lambda: sqlite_db
+    mocker.patch("app.routers.sitemap.SessionLocal", return_value=sqlite_db)
+    mocker.patch("app.routers.sitemap.SITEMAP_SHARD_SIZE", 2)
+
+def test_get_sitemap_index(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker)
+
+    # Act
+    response = client.get("/sitemap_index.xml")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.content.count(b"<sitemap>") == 4
+    assert b"<loc>https://blog.jacobarthurs.com/sitemap-posts-3.xml</loc><lastmod>2026-01-05</lastmod>" in response.content
+    assert b"<loc>https://blog.jacobarthurs.com/sitemap-posts-1.xml</loc><lastmod>2026-01-02</lastmod>" in response.content
+    assert b"<loc>https://blog.jacobarthurs.com/sitemap-tags.xml</loc><lastmod>2026-03-01</lastmod>" in response.content
+    assert response.headers["last-modified"] == "Sun, 01 Mar 2026 00:00:00 GMT"
+
+def test_get_sitemap_index_without_posts(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker, posts=0)
+
+    # Act
+    response = client.get("/sitemap_index.xml")
+
+    # Assert
+    assert b"<loc>https://blog.jacobarthurs.com/sitemap-posts-1.xml</loc></sitemap>" in response.content
+
+def test_get_posts_sitemap_shard(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker)
+
+    # Act
+    response = client.get("/sitemap-posts-2.xml")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/xml"
+    assert response.content.startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
+    assert response.content.count(b"<url>") == 2
+    assert b"<loc>https://blog.jacobarthurs.com/post/post-2</loc><lastmod>2026-01-03</lastmod>" in response.content
+    assert b"post-4" not in response.content
+    assert response.content.endswith(b"</urlset>")
+
+def test_get_posts_sitemap_shard_not_found(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker)
+
+    # Act
+    past_end = client.get("/sitemap-posts-4.xml")
+    zero = client.get("/sitemap-posts-0.xml")
+
+    # Assert
+    assert past_end.status_code == 404
+    assert zero.status_code == 404
+
+def test_get_tags_sitemap(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker)
+
+    # Act
+    response = client.get("/sitemap-tags.xml")
+    cached = client.get("/sitemap-tags.xml", headers={"If-None-Match": response.headers["etag"]})
+    invalidate("tag-list")
+    changed = client.get("/sitemap-tags.xml", headers={"If-None-Match": response.headers["etag"]})
+
+    # Assert
+    assert b"<loc>https://blog.jacobarthurs.com/tag/r&amp;d</loc>" in response.content
+    assert cached.status_code == 304
+    assert changed.status_code == 200
+
+def test_get_rss_feed_precompressed(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker, posts=30)
+
+    # Act
+    compressed = client.get("/rss.xml", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/rss.xml", headers={"Accept-Encoding": "identity"})
+    revalidated = client.get("/rss.xml", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]})
+
+    # Assert
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"].endswith('-gzip"')
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.content == identity.content
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == compressed.headers["etag"].replace("-gzip", "")
+    assert revalidated.status_code == 304
+
+def test_get_rss_feed_last_modified_after_deleting_newest_post(sqlite_db, mocker):
+    # Arrange
+    seed_sitemap(sqlite_db, mocker)
+    first = client.get("/rss.xml")
+    sqlite_db.delete(sqlite_db.query(Post).filter(Post.slug == "post-4").one())
+    sqlite_db.commit()
+    invalidate("post-list")
+
+    # Act
+    response = client.get("/rss.xml", headers={"If-Modified-Since": first.headers["last-modified"]})
+    unchanged = client.get("/rss.xml", headers={"If-Modified-Since": response.headers["last-modified"]})
+
+    # Assert
+    assert first.headers["last-modified"] == "Mon, 05 Jan 2026 00:00:00 GMT"
+    assert response.status_code == 200
+    assert b"post-4" not in response.content
+    assert response.headers["last-modified"] != first.headers["last-modified"]
+    assert unchanged.status_code == 304
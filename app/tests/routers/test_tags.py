@@ -45,6 +45,19 @@ def test_get_tags_with_pagination(mock_db):
     query.order_by.return_value.offset.assert_called_with(10)
     query.order_by.return_value.offset.return_value.limit.assert_called_with(5)
 
+def test_get_tags_not_modified_per_page(mock_db):
+    # Arrange
+    mock_db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+    etag = client.get("/tags/").headers["etag"]
+
+    # Act
+    same_page = client.get("/tags/", headers={"If-None-Match": etag})
+    other_page = client.get("/tags/?offset=10", headers={"If-None-Match": etag})
+
+    # Assert
+    assert same_page.status_code == 304
+    assert other_page.status_code == 200
+
 def test_get_tag_by_id(mock_db):
     # Arrange
     mock_tag = create_mock_tag(1, "Python", "python")
@@ -1,3 +1,5 @@
+import time
+from fnmatch import fnmatch
 from unittest.mock import MagicMock
 from datetime import datetime
 
@@ -33,15 +35,64 @@ def create_mock_tag(id, name, slug, created_at=None, updated_at=None):
     mock_tag.updated_at = updated_at or datetime(2026, 1, 1)
     return mock_tag
 
-def create_mock_comment(id, post_id, author_name, content, parent_id=None, replies=None, like_count=0, depth=0, created_at=None):
+def create_mock_comment(id, post_id, author_name, content, parent_id=None, root_id=None, replies=None, like_count=0, depth=0, created_at=None):
     mock_comment = MagicMock()
     mock_comment.id = id
     mock_comment.post_id = post_id
     mock_comment.parent_id = parent_id
+    mock_comment.root_id = root_id
     mock_comment.author_name = author_name
     mock_comment.content = content
     mock_comment.like_count = like_count
     mock_comment.created_at = created_at or datetime(2026, 1, 1)
     mock_comment.replies = replies or []
     mock_comment.depth = depth
-    return mock_comment
\ No newline at end of file
+    return mock_comment
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the redis client used by RedisCacheBackend"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def _live(self, name):
+        expires = self.expiry.get(name)
+        if expires is not None and expires <= time.monotonic():
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+        return name in self.data
+
+    def get(self, name):
+        return self.data.get(name) if self._live(name) else None
+
+    def mget(self, names):
+        return [self.get(name) for name in names]
+
+    def set(self, name, value, ex=None, nx=False):
+        if nx and self._live(name):
+            return None
+        self.data[name] = value
+        self.expiry.pop(name, None)
+        if ex is not None:
+            self.expiry[name] = time.monotonic() + ex
+        return True
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+
+    def incrby(self, name, amount):
+        value = int(self.get(name) or 0) + amount
+        self.data[name] = str(value).encode()
+        return value
+
+    def exists(self, name):
+        return int(self._live(name))
+
+    def scan_iter(self, match):
+        return [name for name in list(self.data) if fnmatch(name, match)]
+
+    def info(self, section=None):
+        return {"evicted_keys": 0}
@@ -0,0 +1,221 @@
+import pickle
+import time
+from datetime import datetime, timezone
+
+import pytest
+from app.tests.utils import FakeRedis
+from app.utils.cache import MemoryCacheBackend, RedisCacheBackend, BloomDedupBackend, BloomFilter, create_cache_backend
+from app.utils.http_cache import CachedBody
+
+def test_memory_backend_add_dedups():
+    # Arrange
+    cache = MemoryCacheBackend(maxsize=10, ttl=60)
+
+    # Act
+    first = cache.add("1:127.0.0.1")
+    second = cache.add("1:127.0.0.1")
+
+    # Assert
+    assert first is True
+    assert second is False
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+def test_memory_backend_get_set_delete():
+    # Arrange
+    cache = MemoryCacheBackend(maxsize=10)
+
+    # Act
+    cache.set("key", {"a": 1})
+    value = cache.get("key")
+    cache.delete("key")
+
+    # Assert
+    assert value == {"a": 1}
+    assert cache.get("key") is None
+    assert cache.get("key", "fallback") == "fallback"
+
+def test_memory_backend_counts_evictions():
+    # Arrange
+    cache = MemoryCacheBackend(maxsize=2)
+
+    # Act
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    # Assert
+    assert cache.stats.evictions == 1
+    assert "a" not in cache
+    assert "c" in cache
+
+def test_memory_backend_incr():
+    # Arrange
+    cache = MemoryCacheBackend(maxsize=10)
+
+    # Act & Assert
+    assert cache.incr("version") == 1
+    assert cache.incr("version") == 2
+    assert cache.get("version") == 2
+
+def test_memory_backend_per_key_ttl(mocker):
+    # Arrange
+    cache = MemoryCacheBackend(maxsize=10)
+    cache.set("short", 1, ttl=0.01)
+    cache.set("long", 2, ttl=60)
+
+    # Act
+    time.sleep(0.02)
+
+    # Assert
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+def test_redis_backend_add_is_set_if_absent():
+    # Arrange
+    cache = RedisCacheBackend(FakeRedis(), ttl=60)
+
+    # Act
+    first = cache.add("like:1:127.0.0.1")
+    second = cache.add("like:1:127.0.0.1")
+
+    # Assert
+    assert first is True
+    assert second is False
+    assert "like:1:127.0.0.1" in cache
+
+def test_redis_backend_shared_between_instances():
+    # Arrange
+    client = FakeRedis()
+    worker_a = RedisCacheBackend(client)
+    worker_b = RedisCacheBackend(client)
+
+    # Act
+    worker_a.add("1:10.0.0.1")
+
+    # Assert
+    assert worker_b.add("1:10.0.0.1") is False
+
+def test_redis_backend_values_and_counters():
+    # Arrange
+    cache = RedisCacheBackend(FakeRedis())
+
+    # Act
+    cache.set("page", {"items": [1, 2]})
+    cache.incr("version")
+    cache.incr("version", 2)
+
+    # Assert
+    assert cache.get("page") == {"items": [1, 2]}
+    assert cache.get("version") == 3
+    assert cache.get_many(["page", "version", "missing"]) == [{"items": [1, 2]}, 3, None]
+
+def test_redis_backend_round_trips_cached_bodies():
+    # Arrange
+    cache = RedisCacheBackend(FakeRedis())
+    modified = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    body = CachedBody(b"<rss/>", '"abc"', modified, {"gzip": b"\x1f\x8b"})
+
+    # Act
+    cache.set("body", body)
+    cache.set("state", ('"abc"', modified))
+    cache.set("content", b"\x80raw")
+
+    # Assert
+    assert cache.get("body") == body
+    assert isinstance(cache.get("body"), CachedBody)
+    assert cache.get("state") == ('"abc"', modified)
+    assert cache.get("content") == b"\x80raw"
+
+def test_redis_backend_rejects_unregistered_types():
+    # Arrange
+    cache = RedisCacheBackend(FakeRedis())
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        cache.set("object", object())
+
+def test_redis_backend_reads_pickled_entries_as_misses():
+    # Arrange
+    client = FakeRedis()
+    client.set("blog:old", pickle.dumps({"items": [1, 2]}))
+    cache = RedisCacheBackend(client)
+
+    # Act & Assert
+    assert cache.get("old") is None
+
+def test_redis_backend_clear_only_removes_prefix():
+    # Arrange
+    client = FakeRedis()
+    client.set("other:key", b"1")
+    cache = RedisCacheBackend(client, prefix="blog:")
+    cache.set("a", 1)
+
+    # Act
+    cache.clear()
+
+    # Assert
+    assert cache.get("a") is None
+    assert client.get("other:key") == b"1"
+
+def test_bloom_filter_has_no_false_negatives():
+    # Arrange
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"{post_id}:10.0.0.{post_id}" for post_id in range(1000)]
+
+    # Act
+    for key in keys:
+        bloom.add(key)
+
+    # Assert
+    assert all(key in bloom for key in keys)
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    # Arrange
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"seen:{i}")
+
+    # Act
+    false_positives = sum(f"unseen:{i}" in bloom for i in range(5000))
+
+    # Assert
+    assert false_positives / 5000 < 0.03
+
+def test_bloom_backend_dedups_and_rotates(mocker):
+    # Arrange
+    cache = BloomDedupBackend(capacity=100, error_rate=0.01, window=60)
+    mock_time = mocker.patch("app.utils.cache.time.monotonic", return_value=cache._rotated_at)
+
+    # Act
+    first = cache.add("1:127.0.0.1")
+    second = cache.add("1:127.0.0.1")
+    mock_time.return_value += 61
+    after_one_window = cache.add("1:127.0.0.1")
+    mock_time.return_value += 121
+    cache.add("2:127.0.0.1")
+    after_expiry = "1:127.0.0.1" in cache
+
+    # Assert
+    assert first is True
+    assert second is False
+    assert after_one_window is False
+    assert after_expiry is False
+    assert cache.stats.evictions > 0
+
+def test_bloom_backend_memory_is_bounded():
+    # Arrange & Act
+    cache = BloomDedupBackend(capacity=1_000_000, error_rate=0.001)
+
+    # Assert
+    assert cache.info()["bytes"] < 4 * 1024 * 1024
+
+def test_create_cache_backend_bloom_only_for_dedup():
+    # Act & Assert
+    assert isinstance(create_cache_backend("bloom", ttl=60, dedup=True), BloomDedupBackend)
+    with pytest.raises(ValueError):
+        create_cache_backend("bloom")
+
+def test_create_cache_backend_unknown():
+    with pytest.raises(ValueError):
+        create_cache_backend("memcached")
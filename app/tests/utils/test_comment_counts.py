@@ -0,0 +1,63 @@
+from app.models import Comment, Post
+from app.utils.comment_counts import adjust_comment_count, count_comment_subtree, reconcile_comment_counts
+
+def create_post(db, slug="post"):
+    post = Post(title="Post", slug=slug, summary="Summary", content="Content", read_time_minutes=1)
+    db.add(post)
+    db.flush()
+    return post
+
+def create_comment(db, post, parent=None):
+    comment = Comment(post_id=post.id, parent_id=parent.id if parent else None, depth=parent.depth + 1 if parent else 0, author_name="Jo", content="Hi")
+    db.add(comment)
+    db.flush()
+    return comment
+
+def test_adjust_comment_count(sqlite_db):
+    # Arrange
+    post = create_post(sqlite_db)
+    sqlite_db.commit()
+    updated_at = post.updated_at
+
+    # Act
+    adjust_comment_count(sqlite_db, post.id, 2)
+    adjust_comment_count(sqlite_db, post.id, -1)
+    sqlite_db.commit()
+    sqlite_db.refresh(post)
+
+    # Assert
+    assert post.comment_count == 1
+    assert post.updated_at == updated_at
+
+def test_count_comment_subtree(sqlite_db):
+    # Arrange
+    post = create_post(sqlite_db)
+    root = create_comment(sqlite_db, post)
+    reply = create_comment(sqlite_db, post, root)
+    create_comment(sqlite_db, post, reply)
+    create_comment(sqlite_db, post, root)
+    other_root = create_comment(sqlite_db, post)
+
+    # Act & Assert
+    assert count_comment_subtree(sqlite_db, root.id) == 4
+    assert count_comment_subtree(sqlite_db, reply.id) == 2
+    assert count_comment_subtree(sqlite_db, other_root.id) == 1
+
+def test_reconcile_comment_counts(sqlite_db):
+    # Arrange
+    drifted = create_post(sqlite_db, "drifted")
+    correct = create_post(sqlite_db, "correct")
+    create_comment(sqlite_db, drifted)
+    create_comment(sqlite_db, drifted)
+    create_comment(sqlite_db, correct)
+    drifted.comment_count = 7
+    correct.comment_count = 1
+    sqlite_db.commit()
+
+    # Act
+    fixed = reconcile_comment_counts(sqlite_db)
+    sqlite_db.refresh(drifted)
+
+    # Assert
+    assert fixed == 1
+    assert drifted.comment_count == 2
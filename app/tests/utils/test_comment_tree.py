@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+from app.models import Comment, Post
+from app.schemas import CommentResponse
+from app.utils.comment_tree import build_comment_tree, load_comment_trees
+
+def create_post(db, slug="post"):
+    post = Post(title="Post", slug=slug, summary="Summary", content="Content", read_time_minutes=1)
+    db.add(post)
+    db.flush()
+    return post
+
+def create_comment(db, post, parent=None, like_count=0, minutes=0):
+    comment = Comment(
+        post_id=post.id,
+        parent_id=parent.id if parent else None,
+        root_id=(parent.root_id or parent.id) if parent else None,
+        depth=parent.depth + 1 if parent else 0,
+        author_name="Jo",
+        content="Hi",
+        like_count=like_count,
+        created_at=datetime(2026, 1, 1) + timedelta(minutes=minutes)
+    )
+    db.add(comment)
+    db.flush()
+    return comment
+
+def create_thread(db, post, depth=5):
+    root = create_comment(db, post)
+    parent = root
+    for _ in range(depth - 1):
+        create_comment(db, post, parent)
+        parent = create_comment(db, post, parent, like_count=1)
+    return root
+
+def test_build_comment_tree_orders_replies(sqlite_db):
+    # Arrange
+    post = create_post(sqlite_db)
+    root = create_comment(sqlite_db, post)
+    old = create_comment(sqlite_db, post, root, minutes=1)
+    new = create_comment(sqlite_db, post, root, minutes=2)
+    liked = create_comment(sqlite_db, post, root, like_count=3)
+    top = create_comment(sqlite_db, post, like_count=5)
+
+    # Act
+    roots = build_comment_tree([new, root, old, top, liked])
+
+    # Assert
+    assert roots == [top, root]
+    assert root.replies == [liked, new, old]
+    assert top.replies == []
+
+def test_load_comment_trees_uses_one_query(sqlite_db, sql_statements):
+    # Arrange
+    post = create_post(sqlite_db)
+    roots = [create_thread(sqlite_db, post) for _ in range(3)]
+    other_post = create_post(sqlite_db, "other")
+    create_thread(sqlite_db, other_post)
+    sqlite_db.commit()
+    root_ids = [root.id for root in roots]
+    sqlite_db.expire_all()
+    roots = sqlite_db.query(Comment).filter(Comment.id.in_(root_ids)).all()
+    sql_statements.clear()
+
+    # Act
+    load_comment_trees(sqlite_db, roots)
+    data = [CommentResponse.model_validate(root).model_dump() for root in roots]
+
+    # Assert
+    assert len(sql_statements) == 1
+    reply = data[0]
+    for depth in range(1, 5):
+        assert len(reply["replies"]) == 2
+        reply = reply["replies"][0]
+        assert reply["depth"] == depth
+    assert reply["replies"] == []
+
+def test_load_comment_trees_for_reply(sqlite_db, sql_statements):
+    # Arrange
+    post = create_post(sqlite_db)
+    root = create_comment(sqlite_db, post)
+    reply = create_comment(sqlite_db, post, root)
+    nested = create_comment(sqlite_db, post, reply)
+    create_comment(sqlite_db, post, root)
+    sqlite_db.commit()
+    sqlite_db.expire_all()
+    reply = sqlite_db.get(Comment, reply.id)
+    sql_statements.clear()
+
+    # Act
+    load_comment_trees(sqlite_db, [reply])
+    data = CommentResponse.model_validate(reply).model_dump()
+
+    # Assert
+    assert len(sql_statements) == 1
+    assert [child["id"] for child in data["replies"]] == [nested.id]
+
+def test_load_comment_trees_empty(sqlite_db, sql_statements):
+    # Arrange
+    sql_statements.clear()
+
+    # Act
+    roots = load_comment_trees(sqlite_db, [])
+
+    # Assert
+    assert roots == []
+    assert sql_statements == []
@@ -0,0 +1,92 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, compress, preferred_encoding
+
+def create_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse("x" * 1000)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("x" * 10)
+
+    @app.get("/precompressed")
+    def precompressed():
+        return PlainTextResponse(compress(b"y" * 1000, "gzip"), headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+def test_preferred_encoding():
+    # Act & Assert
+    assert preferred_encoding(None, ["br", "gzip"]) is None
+    assert preferred_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert preferred_encoding("gzip, deflate, br", ["gzip"]) == "gzip"
+    assert preferred_encoding("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+    assert preferred_encoding("gzip;q=0, *", ["br", "gzip"]) == "br"
+    assert preferred_encoding("*;q=0", ["br", "gzip"]) is None
+    assert preferred_encoding("identity", ["br", "gzip"]) is None
+    assert preferred_encoding("GZIP;q=bad, br", ["gzip"]) is None
+
+def test_compress_gzip_is_deterministic():
+    # Act
+    first = compress(b"hello" * 100, "gzip")
+    second = compress(b"hello" * 100, "gzip")
+
+    # Assert
+    assert first == second
+    assert gzip.decompress(first) == b"hello" * 100
+
+def test_compress_unknown_encoding():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        compress(b"hello", "zstd")
+
+def test_middleware_gzip(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(compression, "brotli", None)
+    client = create_client()
+
+    # Act
+    large = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    small = client.get("/small", headers={"Accept-Encoding": "gzip, br"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    # Assert
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["vary"] == "Accept-Encoding"
+    assert large.text == "x" * 1000
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+
+def test_middleware_passes_precompressed_through():
+    # Arrange
+    client = create_client()
+
+    # Act
+    response = client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "y" * 1000
+
+def test_middleware_brotli():
+    # Arrange
+    pytest.importorskip("brotli")
+    client = create_client()
+
+    # Act
+    response = client.get("/large", headers={"Accept-Encoding": "br"})
+
+    # Assert
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == "x" * 1000
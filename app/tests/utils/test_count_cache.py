@@ -0,0 +1,77 @@
+import time
+
+from app.utils.cache import app_cache
+from app.utils.count_cache import cached_count
+from app.utils.invalidation import invalidate, versions
+
+def test_versions_are_stable_until_invalidated():
+    # Act
+    first = versions(["post-list", "tag-list"])
+    second = versions(["post-list", "tag-list"])
+    invalidate("post-list")
+    third = versions(["post-list", "tag-list"])
+
+    # Assert
+    assert first == second
+    assert third[0] != first[0]
+    assert third[1] == first[1]
+
+def test_versions_survive_eviction_without_reuse():
+    # Arrange
+    before = versions(["post:1"])
+
+    # Act
+    app_cache.delete("version:post:1")
+    after = versions(["post:1"])
+
+    # Assert
+    assert after != before
+
+def test_versions_expire_after_version_ttl(mocker):
+    # Arrange
+    mocker.patch("app.utils.invalidation.VERSION_TTL", 0.01)
+    before = versions(["post:1"])
+
+    # Act
+    time.sleep(0.02)
+    after = versions(["post:1"])
+
+    # Assert
+    assert after != before
+
+def test_cached_count_computes_once(mocker):
+    # Arrange
+    count = mocker.Mock(return_value=7)
+
+    # Act
+    first = cached_count("posts", ["post-list"], count)
+    second = cached_count("posts", ["post-list"], count)
+
+    # Assert
+    assert first == second == 7
+    count.assert_called_once()
+
+def test_cached_count_recounts_after_invalidation(mocker):
+    # Arrange
+    count = mocker.Mock(side_effect=[7, 8])
+    cached_count("comments:1", ["comments:1"], count)
+
+    # Act
+    invalidate("comments:1")
+    total = cached_count("comments:1", ["comments:1"], count)
+
+    # Assert
+    assert total == 8
+    assert count.call_count == 2
+
+def test_cached_count_keys_are_independent(mocker):
+    # Arrange
+    count_a = mocker.Mock(return_value=1)
+    count_b = mocker.Mock(return_value=2)
+
+    # Act & Assert
+    assert cached_count("comments:1", ["comments:1"], count_a) == 1
+    assert cached_count("comments:2", ["comments:2"], count_b) == 2
+    invalidate("comments:2")
+    assert cached_count("comments:1", ["comments:1"], count_a) == 1
+    count_a.assert_called_once()
@@ -0,0 +1,134 @@
+import pytest
+from app.models import Comment, Post
+from app.utils.counters import CounterBuffer, CounterFlusher
+
+def test_counter_buffer_increment_and_pending():
+    # Arrange
+    buffer = CounterBuffer(Post.__table__.c.view_count)
+
+    # Act
+    buffer.increment(1)
+    buffer.increment(1)
+    buffer.increment(2)
+
+    # Assert
+    assert buffer.pending(1) == 2
+    assert buffer.pending(2) == 1
+    assert buffer.pending(3) == 0
+
+def test_counter_buffer_discard():
+    # Arrange
+    buffer = CounterBuffer(Post.__table__.c.view_count)
+    buffer.increment(1, 3)
+
+    # Act
+    buffer.discard(1)
+
+    # Assert
+    assert buffer.pending(1) == 0
+
+def test_counter_buffer_threshold_requests_flush():
+    # Arrange
+    buffer = CounterBuffer(Post.__table__.c.view_count, flush_threshold=2)
+
+    # Act
+    buffer.increment(1)
+    requested_early = buffer.flush_requested.is_set()
+    buffer.increment(2)
+
+    # Assert
+    assert requested_early is False
+    assert buffer.flush_requested.is_set()
+
+def test_counter_buffer_flush_batches_deltas(mocker):
+    # Arrange
+    mock_db = mocker.MagicMock()
+    buffer = CounterBuffer(Post.__table__.c.view_count)
+    buffer.increment(1)
+    buffer.increment(1)
+    buffer.increment(2)
+
+    # Act
+    written = buffer.flush(mock_db)
+
+    # Assert
+    assert written == 2
+    mock_db.execute.assert_called_once()
+    stmt, params = mock_db.execute.call_args.args
+    assert "view_count=(posts.view_count + :b_delta)" in str(stmt)
+    assert "updated_at=posts.updated_at" in str(stmt)
+    assert sorted(params, key=lambda p: p["b_key"]) == [{"b_key": 1, "b_delta": 2}, {"b_key": 2, "b_delta": 1}]
+    mock_db.commit.assert_called_once()
+    assert buffer.pending(1) == 0
+
+def test_counter_buffer_flush_invalidates_tags(mocker):
+    # Arrange
+    mock_db = mocker.MagicMock()
+    mock_invalidate = mocker.patch("app.utils.counters.invalidate")
+    buffer = CounterBuffer(Post.__table__.c.view_count, invalidates=("post-stats",))
+
+    # Act
+    buffer.flush(mock_db)
+    buffer.increment(1)
+    buffer.flush(mock_db)
+
+    # Assert
+    mock_invalidate.assert_called_once_with("post-stats")
+
+def test_counter_buffer_flush_invalidates_increment_tags(mocker):
+    # Arrange
+    mock_invalidate = mocker.patch("app.utils.counters.invalidate")
+    buffer = CounterBuffer(Comment.__table__.c.like_count)
+    buffer.increment(1, invalidates=("comments:1",))
+    buffer.increment(2, -1, invalidates=("comments:2",))
+
+    # Act
+    buffer.flush(mocker.MagicMock())
+    buffer.increment(1)
+    buffer.flush(mocker.MagicMock())
+
+    # Assert
+    assert sorted(mock_invalidate.call_args_list[0].args) == ["comments:1", "comments:2"]
+    assert mock_invalidate.call_args_list[1].args == ()
+
+def test_counter_buffer_flush_empty_skips_query(mocker):
+    # Arrange
+    mock_db = mocker.MagicMock()
+    buffer = CounterBuffer(Post.__table__.c.view_count)
+
+    # Act
+    written = buffer.flush(mock_db)
+
+    # Assert
+    assert written == 0
+    mock_db.execute.assert_not_called()
+
+def test_counter_buffer_flush_failure_restores_deltas(mocker):
+    # Arrange
+    mock_db = mocker.MagicMock()
+    mock_db.execute.side_effect = RuntimeError("connection lost")
+    buffer = CounterBuffer(Post.__table__.c.view_count)
+    buffer.increment(1, 4)
+
+    # Act & Assert
+    with pytest.raises(RuntimeError):
+        buffer.flush(mock_db)
+
+    mock_db.rollback.assert_called_once()
+    assert buffer.pending(1) == 4
+
+def test_counter_flusher_stop_flushes_remaining(mocker):
+    # Arrange
+    mock_db = mocker.MagicMock()
+    buffer = CounterBuffer(Post.__table__.c.view_count)
+    flusher = CounterFlusher([buffer], interval=60, session_factory=lambda: mock_db)
+    flusher.start()
+    buffer.increment(1)
+
+    # Act
+    flusher.stop()
+
+    # Assert
+    mock_db.execute.assert_called()
+    mock_db.close.assert_called()
+    assert buffer.pending(1) == 0
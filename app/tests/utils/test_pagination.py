@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from app.models import Post, Tag
+from app.utils.pagination import encode_cursor, decode_cursor, paginate
+
+def create_posts(db, count):
+    for i in range(count):
+        db.add(Post(
+            title=f"Post {i}",
+            slug=f"post-{i}",
+            summary="Summary",
+            content="Content",
+            read_time_minutes=1,
+            created_at=datetime(2026, 1, 1 + i % 3, tzinfo=timezone.utc)
+        ))
+    db.commit()
+
+def test_cursor_round_trip():
+    # Arrange
+    created_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    # Act
+    cursor = encode_cursor([created_at, 42])
+    values = decode_cursor(cursor, [Post.created_at, Post.id])
+
+    # Assert
+    assert "=" not in cursor
+    assert values == [created_at, 42]
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1]), encode_cursor({"a": 1})])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, [Post.created_at, Post.id])
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
+
+def test_paginate_offset_mode(sqlite_db):
+    # Arrange
+    create_posts(sqlite_db, 5)
+
+    # Act
+    page = paginate(sqlite_db.query(Post), [Post.created_at, Post.id], offset=2, limit=2)
+
+    # Assert
+    assert page.total == 5
+    assert page.next_cursor is None
+    assert len(page.items) == 2
+
+def test_paginate_cursor_mode_walks_all_rows_in_order(sqlite_db):
+    # Arrange
+    create_posts(sqlite_db, 7)
+    expected = sqlite_db.query(Post).order_by(Post.created_at.desc(), Post.id.desc()).all()
+
+    # Act
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        page = paginate(sqlite_db.query(Post), [Post.created_at, Post.id], offset=0, limit=3, cursor=cursor)
+        seen.extend(page.items)
+        cursor = page.next_cursor
+
+    # Assert
+    assert [post.id for post in seen] == [post.id for post in expected]
+
+def test_paginate_cursor_mode_total_is_optional(sqlite_db):
+    # Arrange
+    create_posts(sqlite_db, 3)
+
+    # Act
+    without_total = paginate(sqlite_db.query(Post), [Post.created_at, Post.id], offset=0, limit=2, cursor="", include_total=False)
+    with_total = paginate(sqlite_db.query(Post), [Post.created_at, Post.id], offset=0, limit=2, cursor="", include_total=True)
+
+    # Assert
+    assert without_total.total is None
+    assert with_total.total == 3
+    assert without_total.next_cursor is not None
+
+def test_paginate_cursor_mode_string_keys(sqlite_db):
+    # Arrange
+    for name in ["alpha", "beta", "gamma"]:
+        sqlite_db.add(Tag(name=name, slug=name))
+    sqlite_db.commit()
+
+    # Act
+    first = paginate(sqlite_db.query(Tag), [Tag.name, Tag.id], offset=0, limit=2, cursor="")
+    second = paginate(sqlite_db.query(Tag), [Tag.name, Tag.id], offset=0, limit=2, cursor=first.next_cursor)
+
+    # Assert
+    assert [tag.name for tag in first.items] == ["gamma", "beta"]
+    assert [tag.name for tag in second.items] == ["alpha"]
+    assert second.next_cursor is None
@@ -0,0 +1,130 @@
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.db import DatabaseRouter, get_db, get_async_db
+from app.schemas import TagResponse
+from app.tests.db.test_routing import FakeAsyncSession
+from app.tests.utils import create_mock_tag
+from app.utils import invalidate
+from app.utils.cache import response_cache
+from app.utils.response_cache import cache_response, cached_value
+
+def set_header(response: Response):
+    response.headers["X-Version"] = "1"
+
+def build_client(mocker, db, mode="sync"):
+    mocker.patch("app.db.database.DATABASE_MODE", mode)
+    router = DatabaseRouter(prefix="/items")
+
+    @router.get("/{item_id}", response_model=TagResponse, dependencies=[Depends(set_header)])
+    @cache_response(["tag:{item_id}"])
+    def get_item(item_id: int, db: Session = Depends(get_db)):
+        item = db.get(item_id)
+        if item is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return item
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_async_db] = lambda: FakeAsyncSession(db)
+    return TestClient(app)
+
+def test_cache_response_serves_cached_bytes(mocker):
+    # Arrange
+    db = mocker.MagicMock()
+    db.get.return_value = create_mock_tag(1, "Python", "python")
+    client = build_client(mocker, db)
+    first = client.get("/items/1?a=1&b=2")
+
+    # Act
+    second = client.get("/items/1?b=2&a=1")
+
+    # Assert
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.json()["name"] == "Python"
+    assert second.headers["content-type"] == "application/json"
+    assert second.headers["x-version"] == "1"
+    db.get.assert_called_once_with(1)
+
+def test_cache_response_invalidated_by_tag(mocker):
+    # Arrange
+    db = mocker.MagicMock()
+    db.get.return_value = create_mock_tag(1, "Python", "python")
+    client = build_client(mocker, db)
+    client.get("/items/1")
+    client.get("/items/2")
+
+    # Act
+    invalidate("tag:1")
+    client.get("/items/1")
+    client.get("/items/2")
+
+    # Assert
+    assert [call.args for call in db.get.call_args_list] == [(1,), (2,), (1,)]
+
+def test_cache_response_skips_errors(mocker):
+    # Arrange
+    db = mocker.MagicMock()
+    db.get.return_value = None
+    client = build_client(mocker, db)
+
+    # Act
+    client.get("/items/1")
+    response = client.get("/items/1")
+
+    # Assert
+    assert response.status_code == 404
+    assert db.get.call_count == 2
+
+def test_cache_response_async_mode(mocker):
+    # Arrange
+    db = mocker.MagicMock()
+    db.get.return_value = create_mock_tag(1, "Python", "python")
+    client = build_client(mocker, db, mode="async")
+
+    # Act
+    first = client.get("/items/1")
+    second = client.get("/items/1")
+
+    # Assert
+    assert first.json() == second.json()
+    assert first.json()["name"] == "Python"
+    db.get.assert_called_once_with(1)
+
+def test_cache_response_async_mode_leaves_loop_for_blocking_backend(mocker):
+    # Arrange
+    db = mocker.MagicMock()
+    db.get.return_value = create_mock_tag(1, "Python", "python")
+    client = build_client(mocker, db, mode="async")
+    mocker.patch.object(response_cache, "blocking", True)
+    threadpool = mocker.patch("app.utils.response_cache.run_in_threadpool", side_effect=run_in_threadpool)
+
+    # Act
+    client.get("/items/1")
+    response = client.get("/items/1")
+
+    # Assert
+    assert response.json()["name"] == "Python"
+    # Lookup and store on the miss, lookup on the hit
+    assert threadpool.call_count == 3
+    db.get.assert_called_once_with(1)
+
+def test_cached_value():
+    # Arrange
+    build = [0]
+    def load():
+        build[0] += 1
+        return {"id": 1}
+
+    # Act
+    cached_value("item:1", ["tag:1"], load)
+    cached_value("item:1", ["tag:1"], load)
+    invalidate("tag:1")
+    value = cached_value("item:1", ["tag:1"], load)
+
+    # Assert
+    assert value == {"id": 1}
+    assert build[0] == 2
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.utils.pagination import encode_cursor, paginate
+from app.utils.search import prefix_tsquery, search_posts, search_tags
+
+def compile_sql(query):
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+def test_prefix_tsquery():
+    # Act & Assert
+    assert prefix_tsquery("Pyth") == "pyth:*"
+    assert prefix_tsquery("fast  API's") == "fast:* & api:* & s:*"
+    assert prefix_tsquery("a&b|c") == "a:* & b:* & c:*"
+    assert prefix_tsquery("!?") is None
+
+def test_search_posts_ilike(sqlite_db):
+    # Act
+    query, order_by = search_posts(sqlite_db, "python", "ilike")
+    sql = compile_sql(query)
+
+    # Assert
+    assert "posts.title ILIKE" in sql
+    assert [column.key for column in order_by] == ["view_count", "created_at", "id"]
+
+def test_search_posts_fulltext(sqlite_db):
+    # Act
+    query, order_by = search_posts(sqlite_db, "pyth tut", "fulltext")
+    sql = compile_sql(query.order_by(*[column.desc() for column in order_by]))
+
+    # Assert
+    assert "WHERE posts.search_vector @@ to_tsquery(" in sql
+    assert "ts_rank(posts.search_vector" in sql
+    assert "ORDER BY search_rank DESC" in sql
+    assert [column.key for column in order_by] == ["search_rank", "created_at", "id"]
+    assert query.statement.compile().params["to_tsquery_2"] == "pyth:* & tut:*"
+
+def test_search_posts_fulltext_cursor(sqlite_db, mocker):
+    # Arrange
+    query, order_by = search_posts(sqlite_db, "python", "fulltext")
+    filter_spy = mocker.spy(type(query), "filter")
+    mocker.patch.object(type(query), "all", return_value=[])
+
+    # Act
+    page = paginate(query, order_by, 0, 10, encode_cursor([0.5, "2026-01-01T00:00:00", 3]), include_total=False)
+
+    # Assert
+    assert page.items == []
+    keyset = str(filter_spy.call_args.args[1].compile(dialect=postgresql.dialect()))
+    assert keyset.startswith("(ts_rank(posts.search_vector")
+
+def test_search_posts_trigram(sqlite_db):
+    # Act
+    query, order_by = search_posts(sqlite_db, "pyhton", "trigram")
+    sql = compile_sql(query.order_by(*[column.desc() for column in order_by]))
+
+    # Assert
+    assert "posts.title ILIKE" in sql
+    assert "(posts.title %% %(title_2)s)" in sql
+    assert "CAST(similarity(posts.title, %(similarity_1)s) AS DOUBLE PRECISION) AS search_rank" in sql
+    assert "ORDER BY search_rank DESC, posts.view_count DESC" in sql
+    assert [column.key for column in order_by] == ["search_rank", "view_count", "created_at", "id"]
+
+def test_search_tags(sqlite_db):
+    # Act
+    ilike_sql = compile_sql(search_tags(sqlite_db, "pyth", "ilike"))
+    trigram_sql = compile_sql(search_tags(sqlite_db, "pyth", "trigram"))
+
+    # Assert
+    assert "ORDER BY tags.created_at DESC" in ilike_sql
+    assert "(tags.name %% %(name_2)s)" in trigram_sql
+    assert "ORDER BY similarity(tags.name, %(similarity_1)s) DESC, tags.created_at DESC" in trigram_sql
+
+def test_search_posts_fulltext_no_words(sqlite_db):
+    # Act
+    query, _ = search_posts(sqlite_db, "!?", "fulltext")
+
+    # Assert
+    assert "false" in compile_sql(query)
+
+def test_search_posts_unknown_backend(sqlite_db):
+    # Act & Assert
+    with pytest.raises(ValueError):
+        search_posts(sqlite_db, "python", "elastic")
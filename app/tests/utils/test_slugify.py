@@ -1,6 +1,7 @@
 import pytest
 from fastapi import HTTPException
-from app.utils.slugify import slugify, validate_unique_slug
+from app.models import Post, Tag
+from app.utils.slugify import commit_unique, slugify, unique_slug, unique_slugs, validate_unique_slug, validate_unique_slugs
 
 def test_slugify_basic():
     assert slugify("Hello World") == "hello-world"
@@ -52,24 +53,19 @@ def test_slugify_already_valid_slug():
 def test_validate_unique_slug_success(mocker):
     # Arrange
     mock_db = mocker.MagicMock()
-    mock_model = mocker.MagicMock()
-    mock_model.__name__ = "Post"
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.scalar.return_value = False
 
     # Act & Assert
-    validate_unique_slug("unique-slug", mock_model, mock_db)
+    validate_unique_slug("unique-slug", Post, mock_db)
 
 def test_validate_unique_slug_duplicate(mocker):
     # Arrange
     mock_db = mocker.MagicMock()
-    mock_model = mocker.MagicMock()
-    mock_model.__name__ = "Post"
-    mock_existing = mocker.MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_existing
+    mock_db.scalar.return_value = True
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
-        validate_unique_slug("duplicate-slug", mock_model, mock_db)
+        validate_unique_slug("duplicate-slug", Post, mock_db)
 
     assert exc_info.value.status_code == 400
     assert exc_info.value.detail == "Post with this slug already exists"
@@ -77,27 +73,75 @@ def test_validate_unique_slug_duplicate(mocker):
 def test_validate_unique_slug_different_models(mocker):
     # Arrange
     mock_db = mocker.MagicMock()
-    mock_tag_model = mocker.MagicMock()
-    mock_tag_model.__name__ = "Tag"
-    mock_existing = mocker.MagicMock()
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_existing
+    mock_db.scalar.return_value = True
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
-        validate_unique_slug("duplicate", mock_tag_model, mock_db)
+        validate_unique_slug("duplicate", Tag, mock_db)
 
     assert exc_info.value.detail == "Tag with this slug already exists"
 
-def test_validate_unique_slug_query_called_correctly(mocker):
+def test_validate_unique_slug_uses_exists_query(mocker):
     # Arrange
     mock_db = mocker.MagicMock()
-    mock_model = mocker.MagicMock()
-    mock_model.__name__ = "Post"
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.scalar.return_value = False
 
     # Act
-    validate_unique_slug("test-slug", mock_model, mock_db)
+    validate_unique_slug("test-slug", Post, mock_db)
 
     # Assert
-    mock_db.query.assert_called_once_with(mock_model)
-    mock_db.query.return_value.filter.return_value.first.assert_called_once()
+    statement = str(mock_db.scalar.call_args.args[0])
+    assert "EXISTS (SELECT" in statement
+    assert "posts.content" not in statement
+    mock_db.query.assert_not_called()
+
+def test_validate_unique_slugs_reports_all_taken(sqlite_db):
+    # Arrange
+    sqlite_db.add_all([Tag(name="Python", slug="python"), Tag(name="Rust", slug="rust")])
+    sqlite_db.commit()
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        validate_unique_slugs(["rust", "go", "python"], Tag, sqlite_db)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Tag with this slug already exists: python, rust"
+
+def test_unique_slug_appends_first_free_suffix(sqlite_db):
+    # Arrange
+    sqlite_db.add_all([Tag(name=name, slug=slug) for name, slug in [("A", "python"), ("B", "python-2"), ("C", "python-tips"), ("D", "python-4")]])
+    sqlite_db.commit()
+
+    # Act
+    slug = unique_slug("python", Tag, sqlite_db)
+    free = unique_slug("rust", Tag, sqlite_db)
+
+    # Assert
+    assert slug == "python-3"
+    assert free == "rust"
+
+def test_unique_slugs_batch_single_query(sqlite_db, sql_statements):
+    # Arrange
+    sqlite_db.add(Tag(name="Python", slug="python"))
+    sqlite_db.commit()
+    sql_statements.clear()
+
+    # Act
+    slugs = unique_slugs(["python", "rust", "python", "rust", "go_lang"], Tag, sqlite_db, reserved=["go_lang"])
+
+    # Assert
+    assert slugs == ["python-2", "rust", "python-3", "rust-2", "go_lang-2"]
+    assert len(sql_statements) == 1
+
+def test_commit_unique_reports_conflict(sqlite_db):
+    # Arrange
+    sqlite_db.add(Tag(name="Python", slug="python"))
+    sqlite_db.commit()
+    sqlite_db.add(Tag(name="Python 3", slug="python"))
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        commit_unique(sqlite_db, Tag)
+
+    assert exc_info.value.status_code == 409
+    assert sqlite_db.query(Tag).count() == 1
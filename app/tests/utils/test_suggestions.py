@@ -0,0 +1,131 @@
+from app.models import Post, Tag
+from app.utils.invalidation import invalidate
+from app.utils.suggestions import PrefixIndex, SuggestionIndex
+
+def create_index():
+    index = PrefixIndex()
+    index.add(1, "Python Tips and Tricks", {"id": 1}, score=5)
+    index.add(2, "Advanced Python", {"id": 2}, score=50)
+    index.add(3, "Rust for Pythonistas", {"id": 3}, score=1)
+    index.add(4, "Typing in Practice", {"id": 4}, score=100)
+    return index
+
+def test_prefix_index_search():
+    # Arrange
+    index = create_index()
+
+    # Act & Assert
+    assert index.search("pyth") == [{"id": 2}, {"id": 1}, {"id": 3}]
+    assert index.search("PYTHON tr") == [{"id": 1}]
+    assert index.search("tips pyth") == [{"id": 1}]
+    assert index.search("pyth", limit=1) == [{"id": 2}]
+    assert index.search("go") == []
+    assert index.search("  ") == []
+
+def test_prefix_index_replace_and_remove():
+    # Arrange
+    index = create_index()
+
+    # Act
+    index.add(1, "Go Tips", {"id": 1, "title": "Go Tips"})
+    index.remove(2)
+    index.remove(99)
+
+    # Assert
+    assert len(index) == 3
+    assert index.search("pyth") == [{"id": 3}]
+    assert index.search("go") == [{"id": 1, "title": "Go Tips"}]
+
+def seed(db):
+    db.add_all([
+        Post(title="Python Tips", slug="python-tips", summary="S", content="C", read_time_minutes=1, view_count=10),
+        Post(title="Pytest Fixtures", slug="pytest-fixtures", summary="S", content="C", read_time_minutes=1, view_count=20),
+        Tag(name="Python", slug="python")
+    ])
+    db.commit()
+
+def test_suggestion_index_serves_from_memory(sqlite_db, sql_statements):
+    # Arrange
+    seed(sqlite_db)
+    index = SuggestionIndex()
+    sql_statements.clear()
+
+    # Act
+    first = index.suggest(sqlite_db, "py")
+    queries_after_build = len(sql_statements)
+    second = index.suggest(sqlite_db, "python")
+
+    # Assert
+    assert queries_after_build == 2
+    assert len(sql_statements) == queries_after_build
+    assert [post["slug"] for post in first["posts"]] == ["pytest-fixtures", "python-tips"]
+    assert second == {"posts": [{"id": 1, "title": "Python Tips", "slug": "python-tips"}], "tags": [{"id": 1, "name": "Python", "slug": "python"}]}
+
+def test_suggestion_index_applies_local_changes(sqlite_db):
+    # Arrange
+    seed(sqlite_db)
+    index = SuggestionIndex()
+    index.rebuild(sqlite_db)
+    post = Post(title="Rust Basics", slug="rust-basics", summary="S", content="C", read_time_minutes=1, view_count=0)
+    sqlite_db.add(post)
+    sqlite_db.commit()
+
+    # Act
+    index.update_post(post, invalidate("post-list"))
+    index.remove_tag(1, invalidate("tag-list", "post-list"))
+
+    # Assert
+    assert not index.is_stale()
+    assert index.suggest(sqlite_db, "rust")["posts"] == [{"id": post.id, "title": "Rust Basics", "slug": "rust-basics"}]
+    assert index.suggest(sqlite_db, "python")["tags"] == []
+
+def test_suggestion_index_rebuilds_after_remote_change(sqlite_db):
+    # Arrange
+    seed(sqlite_db)
+    index = SuggestionIndex()
+    index.rebuild(sqlite_db)
+    sqlite_db.add(Tag(name="Rust", slug="rust"))
+    sqlite_db.commit()
+
+    # Act
+    invalidate("tag-list")
+    result = index.suggest(sqlite_db, "ru")
+
+    # Assert
+    assert result["tags"] == [{"id": 2, "name": "Rust", "slug": "rust"}]
+
+def test_suggestion_index_rebuilds_after_concurrent_remote_change(sqlite_db):
+    # Arrange
+    seed(sqlite_db)
+    index = SuggestionIndex()
+    index.rebuild(sqlite_db)
+    tokens = invalidate("post-list")
+    sqlite_db.add(Tag(name="Rust", slug="rust"))
+    sqlite_db.commit()
+    invalidate("tag-list")
+
+    # Act
+    index.remove_post(1, tokens)
+
+    # Assert
+    assert index.is_stale()
+    assert index.suggest(sqlite_db, "ru")["tags"] == [{"id": 2, "name": "Rust", "slug": "rust"}]
+
+def test_suggestion_index_rebuilds_after_interval(sqlite_db):
+    # Arrange
+    index = SuggestionIndex(rebuild_interval=0)
+    index.rebuild(sqlite_db)
+
+    # Act & Assert
+    assert index.is_stale()
+
+def test_suggestion_index_ignores_changes_before_build():
+    # Arrange
+    index = SuggestionIndex()
+
+    # Act
+    index.remove_post(1, invalidate("post-list"))
+
+    # Assert
+    assert not index.built
+    assert index.is_stale()
@@ -1,12 +1,24 @@
-from .slugify import slugify, validate_unique_slug
+from .slugify import slugify, validate_unique_slug, unique_slug, commit_unique, reporting_conflicts
 from .read_time import calculate_read_time
 from .limiter import limiter
 from .cache import view_cache
+from .counters import view_counter, counter_flusher
+from .pagination import paginate
+from .invalidation import invalidate
+from .suggestions import suggestion_index
 
 __all__ = [
     "slugify",
     "validate_unique_slug",
+    "unique_slug",
+    "commit_unique",
+    "reporting_conflicts",
     "calculate_read_time",
     "limiter",
-    "view_cache"
+    "view_cache",
+    "view_counter",
+    "counter_flusher",
+    "paginate",
+    "invalidate",
+    "suggestion_index"
 ]
@@ -0,0 +1,238 @@
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.orm import Session
+
+from ..models import Comment, Post, PostTag, Tag
+from ..schemas import CommentRecord, PostRecord
+from .featured import clear_featured
+from .read_time import calculate_read_time
+from .slugify import slugify, unique_slugs, validate_unique_slugs
+
+BULK_IMPORT_MAX_POSTS = int(os.getenv("BULK_IMPORT_MAX_POSTS", "5000"))
+EXPORT_STREAM_BATCH = 500
+# Replies deeper than this are rejected when comments are created
+MAX_COMMENT_DEPTH = 4
+
+records_adapter = TypeAdapter(list[PostRecord])
+
+def _inline_refs(schema: dict) -> dict:
+    """Resolve a JSON schema's local `$defs` references so it can be embedded in an operation"""
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+    return resolve(schema)
+
+# The body is parsed by read_post_records, so describe it for OpenAPI by hand
+IMPORT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/x-ndjson": {"schema": {**_inline_refs(PostRecord.model_json_schema()), "description": "One PostRecord per line"}},
+            "application/json": {"schema": _inline_refs(records_adapter.json_schema())}
+        }
+    }
+}
+
+async def read_post_records(request: Request) -> list[PostRecord]:
+    """
+    Parse a bulk import body into post records.
+
+    Accepts NDJSON (one record per line) or a JSON array. Validation errors
+    are reported like any other request body, located by record index.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/json") or body.lstrip().startswith(b"["):
+        try:
+            records = records_adapter.validate_json(body)
+        except ValidationError as exc:
+            raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in exc.errors()])
+    else:
+        records, errors = [], []
+        lines = [line for line in body.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                records.append(PostRecord.model_validate_json(line))
+            except ValidationError as exc:
+                errors += [{**error, "loc": ("body", index, *error["loc"])} for error in exc.errors()]
+        if errors:
+            raise RequestValidationError(errors)
+
+    if len(records) > BULK_IMPORT_MAX_POSTS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_IMPORT_MAX_POSTS} posts can be imported at once")
+    return records
+
+def _comment_depths(comments: list[CommentRecord]) -> dict[int, int]:
+    """Return each comment's reply depth, rejecting unknown parents and over-deep threads"""
+    by_id = {comment.id: comment for comment in comments}
+    if len(by_id) != len(comments):
+        raise HTTPException(status_code=400, detail="Comment ids must be unique within a post")
+
+    depths = {}
+    for comment in comments:
+        depth, parent_id = 0, comment.parent_id
+        while parent_id is not None:
+            if parent_id not in by_id:
+                raise HTTPException(status_code=400, detail=f"Parent comment {parent_id} not found in the same post")
+            depth += 1
+            if depth > MAX_COMMENT_DEPTH:
+                raise HTTPException(status_code=400, detail="Maximum comment reply depth reached")
+            parent_id = by_id[parent_id].parent_id
+        depths[comment.id] = depth
+    return depths
+
+def _resolve_tags(db: Session, records: list[PostRecord]) -> tuple[dict[str, int], int]:
+    """Map every referenced tag slug to a tag id, creating missing tags in one statement"""
+    wanted = {}
+    for record in records:
+        for tag in record.tags:
+            wanted.setdefault(tag.slug or slugify(tag.name), tag.name)
+    if not wanted:
+        return {}, 0
+    # Tag names are unique too, so one name cannot be created under two slugs
+    reused = sorted(name for name, count in Counter(wanted.values()).items() if count > 1)
+    if reused:
+        raise HTTPException(status_code=400, detail=f"Tag names used with different slugs in import: {', '.join(reused)}")
+
+    existing = db.execute(
+        select(Tag.id, Tag.name, Tag.slug).where(or_(Tag.slug.in_(list(wanted)), Tag.name.in_(list(wanted.values()))))
+    ).all()
+    by_slug = {slug: id for id, _, slug in existing}
+    by_name = {name: id for id, name, _ in existing}
+    tag_ids = {slug: by_slug.get(slug, by_name.get(name)) for slug, name in wanted.items()}
+
+    missing = [{"name": wanted[slug], "slug": slug} for slug, id in tag_ids.items() if id is None]
+    if missing:
+        created = db.execute(insert(Tag).returning(Tag.id, sort_by_parameter_order=True), missing).scalars().all()
+        tag_ids.update({row["slug"]: id for row, id in zip(missing, created)})
+    return tag_ids, len(missing)
+
+def import_posts(db: Session, records: list[PostRecord]) -> dict:
+    """
+    Insert posts with their tags and comments within the current transaction.
+
+    Slugs and tags are checked with one query each (two for slugs when some
+    are derived from titles and need a suffix), read times are computed
+    up front and every table is written with a single executemany INSERT
+    (comments with one per reply depth, so parents get their ids first).
+    Returns how many posts, tags and comments were created.
+    """
+    if not records:
+        return {"posts": 0, "tags": 0, "comments": 0}
+
+    # Given slugs must be free; slugs derived from titles get a suffix instead
+    given = [record.slug for record in records if record.slug]
+    duplicates = sorted(slug for slug, count in Counter(given).items() if count > 1)
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate slugs in import: {', '.join(duplicates)}")
+    validate_unique_slugs(given, Post, db)
+    derived = iter(unique_slugs([slugify(record.title) for record in records if not record.slug], Post, db, reserved=given))
+    slugs = [record.slug or next(derived) for record in records]
+    if sum(record.featured for record in records) > 1:
+        raise HTTPException(status_code=400, detail="Only one imported post can be featured")
+    depths = [_comment_depths(record.comments) for record in records]
+
+    tag_ids, tags_created = _resolve_tags(db, records)
+    if any(record.featured for record in records):
+        clear_featured(db)
+
+    now = datetime.now(timezone.utc)
+    post_rows = [
+        {
+            "title": record.title,
+            "slug": slug,
+            "summary": record.summary,
+            "content": record.content,
+            "read_time_minutes": calculate_read_time(record.content),
+            "featured": record.featured,
+            "view_count": record.view_count,
+            "comment_count": len(record.comments),
+            "created_at": record.created_at or now,
+            "updated_at": record.updated_at or record.created_at or now
+        }
+        for record, slug in zip(records, slugs)
+    ]
+    post_ids = db.execute(insert(Post).returning(Post.id, sort_by_parameter_order=True), post_rows).scalars().all()
+
+    post_tag_rows = list({
+        (post_id, tag_ids[tag.slug or slugify(tag.name)]): None
+        for post_id, record in zip(post_ids, records)
+        for tag in record.tags
+    })
+    if post_tag_rows:
+        db.execute(insert(PostTag), [{"post_id": post_id, "tag_id": tag_id} for post_id, tag_id in post_tag_rows])
+
+    # Source comment id -> new (id, root id), per post
+    created = [{} for _ in records]
+    levels = defaultdict(list)
+    for index, record in enumerate(records):
+        for comment in record.comments:
+            levels[depths[index][comment.id]].append((index, comment))
+
+    for depth in sorted(levels):
+        comment_rows = []
+        for index, comment in levels[depth]:
+            parent = created[index][comment.parent_id] if comment.parent_id is not None else None
+            comment_rows.append({
+                "post_id": post_ids[index],
+                "parent_id": parent[0] if parent else None,
+                "root_id": (parent[1] or parent[0]) if parent else None,
+                "depth": depth,
+                "author_name": comment.author_name,
+                "content": comment.content,
+                "like_count": comment.like_count,
+                "created_at": comment.created_at or now
+            })
+        comment_ids = db.execute(insert(Comment).returning(Comment.id, sort_by_parameter_order=True), comment_rows).scalars().all()
+        for (index, comment), row, comment_id in zip(levels[depth], comment_rows, comment_ids):
+            created[index][comment.id] = (comment_id, row["root_id"])
+
+    return {"posts": len(post_ids), "tags": tags_created, "comments": sum(len(level) for level in levels.values())}
+
+def export_post_records(db: Session, batch_size: int = EXPORT_STREAM_BATCH):
+    """
+    Yield every post as an NDJSON line in the PostRecord format, ordered by id.
+
+    Posts are read from a server-side cursor in batches of `batch_size`, and
+    each batch's tags and comments are loaded with one query apiece, so
+    memory stays flat however many posts there are.
+    """
+    columns = (Post.id, Post.title, Post.slug, Post.summary, Post.content, Post.featured, Post.view_count, Post.created_at, Post.updated_at)
+    result = db.execute(select(*columns).order_by(Post.id).execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        post_ids = [row.id for row in rows]
+
+        tags = defaultdict(list)
+        for post_id, name, slug in db.execute(
+            select(PostTag.post_id, Tag.name, Tag.slug).join(Tag, Tag.id == PostTag.tag_id).where(PostTag.post_id.in_(post_ids)).order_by(Tag.id)
+        ):
+            tags[post_id].append({"name": name, "slug": slug})
+
+        comments = defaultdict(list)
+        for comment in db.execute(
+            select(Comment.id, Comment.post_id, Comment.parent_id, Comment.author_name, Comment.content, Comment.like_count, Comment.created_at)
+            .where(Comment.post_id.in_(post_ids))
+            .order_by(Comment.id)
+        ):
+            comments[comment.post_id].append(CommentRecord.model_validate(comment._mapping))
+
+        yield b"".join(
+            PostRecord(
+                **{key: value for key, value in row._mapping.items() if key != "id"},
+                tags=tags[row.id],
+                comments=comments[row.id]
+            ).model_dump_json().encode() + b"\n"
+            for row in rows
+        )
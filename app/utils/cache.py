@@ -1,3 +1,425 @@
-from cachetools import TTLCache
+import base64
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
 
-view_cache = TTLCache(maxsize=10000, ttl=3600)
+from cachetools import TLRUCache
+
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "100000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+VIEW_CACHE_BACKEND = os.getenv("VIEW_CACHE_BACKEND", "memory")
+VIEW_CACHE_TTL = int(os.getenv("VIEW_CACHE_TTL", "3600"))
+BLOOM_CAPACITY = int(os.getenv("BLOOM_CAPACITY", "1000000"))
+BLOOM_ERROR_RATE = float(os.getenv("BLOOM_ERROR_RATE", "0.001"))
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", CACHE_BACKEND)
+RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", "1000"))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+
+class CacheStats:
+    """Hit, miss and eviction counters for a cache backend"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def reset(self) -> None:
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class CacheBackend:
+    """
+    Key/value store used for dedup markers, counters and cached values.
+
+    `add` is the dedup primitive: it stores the key only if it is absent and
+    reports whether it did, atomically for shared backends.
+    `blocking` is true when calls are network round trips, which async
+    handlers should then make off the event loop.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: str, default=None):
+        raise NotImplementedError
+
+    def get_many(self, keys: list[str]) -> list:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value, ttl: int | None = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value=True, ttl: int | None = None) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def info(self) -> dict:
+        """Return the backend kind and its counters"""
+        return {"backend": type(self).__name__, **self.stats.as_dict()}
+
+
+class _CountingTLRUCache(TLRUCache):
+    def __init__(self, maxsize, ttu, stats: CacheStats):
+        super().__init__(maxsize, ttu)
+        self._stats = stats
+
+    def popitem(self):
+        item = super().popitem()
+        self._stats.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self._stats.expirations += len(expired)
+        return expired
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache with per-key TTLs"""
+
+    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: int | None = None):
+        super().__init__()
+        self.default_ttl = ttl
+        self._data = _CountingTLRUCache(maxsize, self._ttu, self.stats)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _ttu(key, entry, now):
+        _, ttl = entry
+        return math.inf if ttl is None else now + ttl
+
+    def _ttl(self, ttl):
+        return self.default_ttl if ttl is None else ttl
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            self.stats.record(entry is not None)
+            return default if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (value, self._ttl(ttl))
+
+    def add(self, key, value=True, ttl=None):
+        with self._lock:
+            exists = key in self._data
+            self.stats.record(exists)
+            if not exists:
+                self._data[key] = (value, self._ttl(ttl))
+            return not exists
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value, ttl = self._data.get(key, (0, None))
+            value += amount
+            self._data[key] = (value, ttl)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.stats.reset()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def info(self):
+        return {**super().info(), "size": len(self._data), "maxsize": self._data.maxsize}
+
+
+# NamedTuple types a shared backend may store, by name
+_CACHEABLE_TYPES: dict[str, type] = {}
+
+def cacheable(cls):
+    """Register a NamedTuple so RedisCacheBackend can store and rebuild it"""
+    _CACHEABLE_TYPES[cls.__name__] = cls
+    return cls
+
+def _encode(value):
+    """
+    Convert a cached value to plain JSON.
+
+    Anything JSON has no type for (bytes, datetimes, tuples, dicts) becomes a
+    one-key object naming its type, so decoding is unambiguous and never
+    builds a type that was not registered with `cacheable`.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return {"bytes": base64.b64encode(value).decode()}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {"dict": {key: _encode(item) for key, item in value.items()}}
+    if type(value) is tuple:
+        return {"tuple": [_encode(item) for item in value]}
+    if isinstance(value, tuple) and _CACHEABLE_TYPES.get(type(value).__name__) is type(value):
+        return {type(value).__name__: [_encode(item) for item in value]}
+    raise TypeError(f"{type(value).__name__} values cannot be stored in a shared cache")
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    (kind, data), = value.items()
+    if kind == "bytes":
+        return base64.b64decode(data)
+    if kind == "datetime":
+        return datetime.fromisoformat(data)
+    if kind == "dict":
+        return {key: _decode(item) for key, item in data.items()}
+    if kind == "tuple":
+        return tuple(_decode(item) for item in data)
+    return _CACHEABLE_TYPES[kind](*(_decode(item) for item in data))
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all workers through a Redis-protocol server.
+
+    Bytes are stored as they are and other values as tagged JSON, each
+    behind a one-byte marker; counters written by `incr` are stored as plain
+    integers so the server can update them atomically. Entries in any other
+    format, e.g. written by an older release, read as misses.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "blog:", ttl: int | None = None):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = ttl
+
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+
+    def _ttl(self, ttl):
+        return self.default_ttl if ttl is None else ttl
+
+    @staticmethod
+    def _dumps(value):
+        if isinstance(value, bytes):
+            return b"b" + value
+        return b"j" + json.dumps(_encode(value), separators=(",", ":")).encode()
+
+    @staticmethod
+    def _loads(raw):
+        if raw is None:
+            return None
+        marker = raw[:1]
+        if marker == b"b":
+            return raw[1:]
+        if marker == b"j":
+            return _decode(json.loads(raw[1:]))
+        if marker.isdigit() or marker == b"-":
+            return int(raw)
+        return None
+
+    def get(self, key, default=None):
+        value = self._loads(self.client.get(self._key(key)))
+        self.stats.record(value is not None)
+        return default if value is None else value
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        values = [self._loads(raw) for raw in self.client.mget([self._key(key) for key in keys])]
+        for value in values:
+            self.stats.record(value is not None)
+        return values
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self._key(key), self._dumps(value), ex=self._ttl(ttl))
+
+    def add(self, key, value=True, ttl=None):
+        added = bool(self.client.set(self._key(key), self._dumps(value), ex=self._ttl(ttl), nx=True))
+        self.stats.record(not added)
+        return added
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def incr(self, key, amount=1):
+        return int(self.client.incrby(self._key(key), amount))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+        self.stats.reset()
+
+    def __contains__(self, key):
+        return bool(self.client.exists(self._key(key)))
+
+    def info(self):
+        info = super().info()
+        try:
+            info["server_evictions"] = self.client.info("stats").get("evicted_keys")
+        except Exception:
+            info["server_evictions"] = None
+        return info
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for a capacity and false-positive rate"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key: str) -> bool:
+        """Insert a key, returning False if it was probably already present"""
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+
+class BloomDedupBackend(CacheBackend):
+    """
+    Probabilistic dedup store with bounded memory.
+
+    Keys are tracked in two rotating Bloom filters, each covering one window,
+    so a key is remembered for between one and two windows. Only `add` and
+    membership are supported; a false positive means a duplicate event is
+    occasionally dropped, never double counted.
+    """
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE, window: int = VIEW_CACHE_TTL):
+        super().__init__()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window = window
+        self._lock = threading.Lock()
+        self._reset_filters()
+
+    def _reset_filters(self):
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._previous = BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = time.monotonic()
+
+    def _rotate(self):
+        elapsed = time.monotonic() - self._rotated_at
+        if elapsed < self.window and self._current.count < self.capacity:
+            return
+        self.stats.evictions += self._previous.count
+        if elapsed >= 2 * self.window:
+            self.stats.evictions += self._current.count
+            self._current = BloomFilter(self.capacity, self.error_rate)
+        self._previous = self._current
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = time.monotonic()
+
+    def add(self, key, value=True, ttl=None):
+        with self._lock:
+            self._rotate()
+            in_previous = key in self._previous
+            seen = not self._current.add(key) or in_previous
+            self.stats.record(seen)
+            return not seen
+
+    def clear(self):
+        with self._lock:
+            self._reset_filters()
+            self.stats.reset()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._current or key in self._previous
+
+    def info(self):
+        return {
+            **super().info(),
+            "size": self._current.count + self._previous.count,
+            "bytes": len(self._current.bits) + len(self._previous.bits)
+        }
+
+
+def create_cache_backend(kind: str, ttl: int | None = None, maxsize: int = CACHE_MAXSIZE, dedup: bool = False) -> CacheBackend:
+    """
+    Build a cache backend by name.
+
+    - memory: per-process LRU/TTL cache
+    - redis: shared store at REDIS_URL (requires the `redis` package)
+    - bloom: per-process probabilistic dedup store, only allowed for a
+      `dedup` cache since it cannot return stored values
+    """
+    if kind == "bloom" and not dedup:
+        raise ValueError("The bloom cache backend only supports dedup markers, use memory or redis")
+    if kind == "memory":
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+    if kind == "redis":
+        import redis
+        return RedisCacheBackend(redis.Redis.from_url(REDIS_URL), ttl=ttl)
+    if kind == "bloom":
+        return BloomDedupBackend(window=ttl or VIEW_CACHE_TTL)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+view_cache = create_cache_backend(VIEW_CACHE_BACKEND, ttl=VIEW_CACHE_TTL, dedup=True)
+
+app_cache = create_cache_backend(CACHE_BACKEND)
+
+# Serialized GET responses are large, so they get their own smaller LRU
+response_cache = create_cache_backend(RESPONSE_CACHE_BACKEND, ttl=RESPONSE_CACHE_TTL, maxsize=RESPONSE_CACHE_MAXSIZE)
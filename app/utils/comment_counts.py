@@ -0,0 +1,35 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..models import Comment, Post
+
+def adjust_comment_count(db: Session, post_id: int, delta: int) -> None:
+    """Atomically add delta to a post's stored comment count within the current transaction"""
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + delta, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+def count_comment_subtree(db: Session, comment_id: int) -> int:
+    """Count a comment and all of its descendant replies"""
+    subtree = select(Comment.id).where(Comment.id == comment_id).cte(name="subtree", recursive=True)
+    subtree = subtree.union_all(select(Comment.id).where(Comment.parent_id == subtree.c.id))
+    return db.execute(select(func.count()).select_from(subtree)).scalar_one()
+
+def reconcile_comment_counts(db: Session) -> int:
+    """
+    Repair stored comment counts that drifted from the comments table.
+
+    Returns the number of posts corrected.
+    """
+    actual = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+    result = db.execute(
+        update(Post)
+        .where(Post.comment_count != actual)
+        .values(comment_count=actual, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
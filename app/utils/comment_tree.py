@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..models import Comment
+
+def _reply_order(comment):
+    return (comment.like_count, comment.created_at)
+
+def build_comment_tree(comments: list) -> list:
+    """
+    Link comments to their replies in memory and return the roots.
+
+    Every comment gets its `replies` collection set as already loaded, so
+    serializing the tree never lazy loads. A comment whose parent is not in
+    `comments` is a root. Roots and replies are ordered like the `replies`
+    relationship: most liked first, then newest.
+    """
+    by_id = {comment.id: comment for comment in comments}
+    children = defaultdict(list)
+    roots = []
+    for comment in by_id.values():
+        if comment.parent_id in by_id:
+            children[comment.parent_id].append(comment)
+        else:
+            roots.append(comment)
+
+    for comment in by_id.values():
+        replies = sorted(children.get(comment.id, []), key=_reply_order, reverse=True)
+        set_committed_value(comment, "replies", replies)
+
+    return sorted(roots, key=_reply_order, reverse=True)
+
+def load_comment_trees(db: Session, roots: list) -> list:
+    """
+    Load every descendant of `roots` in one query and attach them.
+
+    Descendants are selected by thread (`root_id`) below the shallowest
+    requested depth, which is a range scan on the root_id index. Replies in
+    the same threads that do not hang under a requested comment are loaded
+    but left detached. Returns `roots` in their original order.
+    """
+    if not roots:
+        return roots
+
+    thread_ids = list({root.root_id or root.id for root in roots})
+    min_depth = min(root.depth for root in roots)
+    comments = db.query(Comment).filter(Comment.root_id.in_(thread_ids), Comment.depth > min_depth).all()
+
+    build_comment_tree([*roots, *comments])
+    return roots
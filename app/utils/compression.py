@@ -0,0 +1,101 @@
+import gzip
+import os
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1000"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# Cached artifacts are compressed once, so they use the strongest settings
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 11
+
+def available_encodings() -> list[str]:
+    """Content codings this process can produce, most preferred first"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+def preferred_encoding(accept_encoding: str | None, encodings: list[str]) -> str | None:
+    """
+    Pick the content coding to use for an Accept-Encoding header.
+
+    Returns the acceptable coding with the highest q-value, breaking ties by
+    the order of `encodings`, or None if identity should be sent.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    def quality(encoding):
+        return weights.get(encoding, weights.get("*", 0.0))
+
+    return max((encoding for encoding in encodings if quality(encoding) > 0), key=quality, default=None)
+
+def compress(content: bytes, encoding: str) -> bytes:
+    """Compress a complete body at the precompression settings"""
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=PRECOMPRESS_GZIP_LEVEL, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(content, quality=PRECOMPRESS_BROTLI_QUALITY)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = BROTLI_QUALITY) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        # Flush each streamed chunk so clients receive it without waiting for the end
+        return compressed + (self.compressor.flush() if more_body else self.compressor.finish())
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip according to Accept-Encoding.
+
+    Brotli is only offered when the optional `brotli` package is installed.
+    Bodies below `minimum_size` are sent as is, and responses that already
+    carry a Content-Encoding (precompressed cached artifacts) pass through
+    untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = preferred_encoding(Headers(scope=scope).get("accept-encoding"), available_encodings())
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+        elif encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
@@ -0,0 +1,21 @@
+import os
+from typing import Callable
+
+from .cache import app_cache
+from .invalidation import versions
+
+COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", "300"))
+
+def cached_count(key: str, tags: list[str], count: Callable[[], int]) -> int:
+    """
+    Return a total count from the cache, computing it on a miss.
+
+    The entry is stored under the current versions of `tags`, so invalidating
+    any of them makes the next request recount.
+    """
+    cache_key = f"count:{key}:{':'.join(versions(tags))}"
+    total = app_cache.get(cache_key)
+    if total is None:
+        total = count()
+        app_cache.set(cache_key, total, ttl=COUNT_CACHE_TTL)
+    return total
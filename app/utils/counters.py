@@ -0,0 +1,165 @@
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from sqlalchemy import bindparam, update
+
+from ..db import SessionLocal
+from ..models import Comment, Post
+from .invalidation import invalidate
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FLUSH_INTERVAL = float(os.getenv("COUNTER_FLUSH_INTERVAL", "10"))
+COUNTER_FLUSH_THRESHOLD = int(os.getenv("COUNTER_FLUSH_THRESHOLD", "100"))
+# Coalesce comment likes and dislikes in memory instead of writing each one
+REACTION_BUFFERING = os.getenv("REACTION_BUFFERING", "false").lower() == "true"
+
+
+class CounterBuffer:
+    """
+    Write-behind buffer for an integer counter column.
+
+    Increments are accumulated in memory per primary key and written back as
+    a single batched `UPDATE ... SET col = col + :delta` statement, so hot
+    read paths never take a row lock on the counted table. Each flush that
+    writes anything invalidates the `invalidates` cache tags, plus any tags
+    passed with the increments it wrote.
+    """
+
+    def __init__(self, column, flush_threshold: int = COUNTER_FLUSH_THRESHOLD, invalidates: tuple[str, ...] = ()):
+        self.column = column
+        self.table = column.table
+        self.flush_threshold = flush_threshold
+        self.invalidates = invalidates
+        self.flush_requested = threading.Event()
+        self._pending = defaultdict(int)
+        self._tags = set()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def increment(self, key: int, amount: int = 1, invalidates: tuple[str, ...] = ()) -> None:
+        """Buffer an increment, requesting a flush once the threshold is reached"""
+        with self._lock:
+            self._pending[key] += amount
+            self._tags.update(invalidates)
+            self._size += abs(amount)
+            if self._size >= self.flush_threshold:
+                self.flush_requested.set()
+
+    def pending(self, key: int) -> int:
+        """Return the unflushed delta for a key"""
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def discard(self, key: int) -> None:
+        """Drop the unflushed delta for a key, e.g. after the counter was overwritten"""
+        with self._lock:
+            self._size -= abs(self._pending.pop(key, 0))
+
+    def clear(self) -> None:
+        """Drop all unflushed deltas"""
+        with self._lock:
+            self._pending.clear()
+            self._tags.clear()
+            self._size = 0
+
+    def flush(self, db) -> int:
+        """
+        Write all buffered deltas in one executemany UPDATE and commit.
+
+        Returns the number of keys written. On failure the deltas are merged
+        back into the buffer so no increments are lost.
+        """
+        with self._lock:
+            batch = {key: delta for key, delta in self._pending.items() if delta}
+            tags = self._tags
+            self._pending.clear()
+            self._tags = set()
+            self._size = 0
+
+        if not batch:
+            return 0
+
+        pk = next(iter(self.table.primary_key.columns))
+        values = {self.column.name: self.column + bindparam("b_delta")}
+        # A counter bump is not an edit, so keep onupdate timestamps untouched
+        values.update({column.name: column for column in self.table.columns if column.onupdate is not None})
+        stmt = update(self.table).where(pk == bindparam("b_key")).values(values)
+
+        try:
+            db.execute(stmt, [{"b_key": key, "b_delta": delta} for key, delta in batch.items()])
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                for key, delta in batch.items():
+                    self._pending[key] += delta
+                    self._size += abs(delta)
+                self._tags.update(tags)
+            raise
+
+        invalidate(*self.invalidates, *tags)
+        return len(batch)
+
+
+class CounterFlusher:
+    """Background thread that flushes counter buffers on an interval or when one fills up"""
+
+    def __init__(self, buffers, interval: float = COUNTER_FLUSH_INTERVAL, session_factory=SessionLocal):
+        self.buffers = list(buffers)
+        self.interval = interval
+        self.session_factory = session_factory
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        for buffer in self.buffers:
+            buffer.flush_requested = self._wake
+
+    def flush_all(self) -> None:
+        """Flush every registered buffer using a fresh session"""
+        db = self.session_factory()
+        try:
+            for buffer in self.buffers:
+                try:
+                    buffer.flush(db)
+                except Exception:
+                    logger.exception("Failed to flush counter buffer for %s", buffer.column)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="counter-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and write out anything still buffered"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        self.flush_all()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.flush_all()
+
+
+# Flushed views change what post reads return, but not feeds or counts
+view_counter = CounterBuffer(Post.__table__.c.view_count, invalidates=("post-stats",))
+
+# Each reaction passes the comments tag of its post
+like_counter = CounterBuffer(Comment.__table__.c.like_count)
+
+counter_flusher = CounterFlusher([view_counter, like_counter])
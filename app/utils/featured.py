@@ -0,0 +1,38 @@
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models import Post
+from .response_cache import cached_value
+
+def featured_post_id(db: Session) -> Optional[int]:
+    """Return the featured post's id, cached until the post list changes"""
+    # cached_value rebuilds on None, so "no featured post" is cached as 0
+    post_id = cached_value(
+        "post:featured",
+        ["post-list"],
+        lambda: db.execute(select(Post.id).where(Post.featured == True)).scalar() or 0
+    )
+    return post_id or None
+
+def clear_featured(db: Session, keep_id: Optional[int] = None) -> None:
+    """Unfeature the featured post, unless it is `keep_id`, within the current transaction"""
+    db.execute(
+        update(Post)
+        .where(Post.featured == True, Post.id != keep_id)
+        .values(featured=False)
+        .execution_options(synchronize_session=False)
+    )
+
+def feature_post(db: Session, post: Post) -> None:
+    """
+    Make `post` the only featured post within the current transaction.
+
+    The previous featured post is found through the partial unique index on
+    `posts.featured`, which also guarantees a single featured post: when two
+    swaps race, the one committing second fails with an IntegrityError
+    instead of leaving two posts featured.
+    """
+    clear_featured(db, post.id)
+    post.featured = True
@@ -0,0 +1,142 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, NamedTuple
+
+from fastapi import HTTPException, Request, Response
+
+from .cache import app_cache, cacheable
+from .compression import COMPRESSION_MINIMUM_SIZE, available_encodings, compress, preferred_encoding
+from .invalidation import versions
+
+BODY_CACHE_TTL = int(os.getenv("BODY_CACHE_TTL", "86400"))
+
+@cacheable
+class CachedBody(NamedTuple):
+    content: bytes
+    etag: str
+    last_modified: datetime
+    # Precompressed copies of content by content coding
+    variants: dict = {}
+
+def to_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def make_etag(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+def version_etag(tags: list[str], name: str) -> str:
+    """Weak ETag for a resource derived from the current versions of its tags"""
+    digest = hashlib.blake2b(":".join([name, *versions(tags)]).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+def cached_body(key: str, tags: list[str], build: Callable[[], tuple[bytes, datetime | None]]) -> CachedBody:
+    """
+    Return a generated response body from the cache, building it on a miss.
+
+    `build` returns the body and the time its content last changed (None for
+    now). The entry is stored under the current versions of `tags`, so it is
+    rebuilt only after one of them is invalidated. Bodies large enough to be
+    worth it are stored with a precompressed copy per supported coding.
+
+    Last-Modified never moves backwards: the previous build's ETag and
+    Last-Modified are remembered per key, and a changed body whose newest
+    row is not newer (e.g. after the newest post was deleted) is stamped
+    with the build time, so If-Modified-Since clients see the change.
+    """
+    cache_key = f"body:{key}:{':'.join(versions(tags))}"
+    body = app_cache.get(cache_key)
+    if body is None:
+        content, last_modified = build()
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        last_modified = to_utc(last_modified or now).replace(microsecond=0)
+        etag = make_etag(content)
+        previous = app_cache.get(f"body-state:{key}")
+        if previous is not None:
+            previous_etag, previous_modified = previous
+            if previous_etag == etag:
+                last_modified = previous_modified
+            elif last_modified <= previous_modified:
+                last_modified = max(now, previous_modified + timedelta(seconds=1))
+        app_cache.set(f"body-state:{key}", (etag, last_modified))
+        variants = {}
+        if len(content) >= COMPRESSION_MINIMUM_SIZE:
+            variants = {encoding: compress(content, encoding) for encoding in available_encodings()}
+        body = CachedBody(content, etag, last_modified, variants)
+        app_cache.set(cache_key, body, ttl=BODY_CACHE_TTL)
+    return body
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """
+    Evaluate a request's conditional headers.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    it is absent, as RFC 9110 requires.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return to_utc(last_modified) <= to_utc(since)
+    return False
+
+def conditional_response(request: Request, body: CachedBody, media_type: str, cache_control: str | None = None) -> Response:
+    """
+    Serve a cached body, or an empty 304 if the client's copy is current.
+
+    A precompressed variant is chosen by Accept-Encoding. Each coding is a
+    separate representation with its own ETag, as RFC 9110 requires.
+    """
+    encoding = preferred_encoding(request.headers.get("accept-encoding"), list(body.variants))
+    etag = body.etag if encoding is None else f'{body.etag[:-1]}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(body.last_modified, usegmt=True),
+        "Vary": "Accept-Encoding"
+    }
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    if not_modified(request, etag, body.last_modified):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(content=body.content, media_type=media_type, headers=headers)
+    return Response(content=body.variants[encoding], media_type=media_type, headers={**headers, "Content-Encoding": encoding})
+
+def version_validator(tags: list[str], cache_control: str):
+    """
+    Build a route dependency that answers conditional GETs from version tokens.
+
+    `tags` may reference path parameters, e.g. "post:{post_id}". The ETag is
+    derived from the URL and the tags' current versions, so a matching
+    If-None-Match is answered with a 304 before the handler runs and without
+    touching the database. Otherwise the ETag and `cache_control` are added to
+    the handler's response.
+    """
+    def dependency(request: Request, response: Response):
+        resolved = [tag.format(**request.path_params) for tag in tags]
+        etag = version_etag(resolved, f"{request.url.path}?{request.url.query}")
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return dependency
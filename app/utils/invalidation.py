@@ -0,0 +1,49 @@
+import os
+from uuid import uuid4
+
+from .cache import CACHE_BACKEND, app_cache
+
+# In-process tokens are not shared, so a write on one worker leaves the others
+# serving their own cached entries; expiring the tokens bounds that staleness.
+# A shared backend sees every write, so its tokens never expire by default.
+VERSION_TTL = float(os.getenv("VERSION_TTL", "30" if CACHE_BACKEND == "memory" else "0")) or None
+
+# Cache dependency tags bumped by write handlers:
+#   post-list          any post created, updated or deleted
+#   tag-list           any tag created, updated or deleted
+#   post:{id}          a single post, including its comment count
+#   tag:{id}           a single tag
+#   comments:{post_id} the comments on a post, including their like counts
+#   post-stats         view or comment counts of any post
+
+def _version_key(tag: str) -> str:
+    return f"version:{tag}"
+
+def _new_version() -> str:
+    return uuid4().hex[:16]
+
+def versions(tags: list[str]) -> list[str]:
+    """
+    Return the current version token of each tag.
+
+    Tokens are random rather than counters, so a version lost to eviction or a
+    cache restart is replaced by a fresh token and can never match an entry
+    cached under an earlier one. The same holds when a token outlives
+    `VERSION_TTL`.
+    """
+    tokens = app_cache.get_many([_version_key(tag) for tag in tags])
+    for i, token in enumerate(tokens):
+        if token is None:
+            key = _version_key(tags[i])
+            token = _new_version()
+            if not app_cache.add(key, token, ttl=VERSION_TTL):
+                token = app_cache.get(key) or token
+            tokens[i] = token
+    return tokens
+
+def invalidate(*tags: str) -> dict[str, str]:
+    """Give each tag a new version, invalidating everything cached against it, and return the new tokens"""
+    tokens = {tag: _new_version() for tag in tags}
+    for tag, token in tokens.items():
+        app_cache.set(_version_key(tag), token, ttl=VERSION_TTL)
+    return tokens
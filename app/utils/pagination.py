@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, tuple_
+
+from ..schemas import PaginatedResponse
+from .count_cache import cached_count
+
+def encode_cursor(values: list) -> str:
+    """Encode sort key values as an opaque URL-safe cursor"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    """
+    Decode a cursor produced by `encode_cursor` for the given sort columns.
+
+    Raises:
+        HTTPException: 400 error if the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("cursor does not match sort order")
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, payload)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(query, order_by: list, offset: int, limit: int, cursor: str | None = None, include_total: bool = True, count_key: str | None = None, count_tags: list[str] | None = None) -> PaginatedResponse:
+    """
+    Page a query sorted descending by `order_by`.
+
+    Without a cursor this is offset/limit pagination with a total count. With a
+    cursor (an empty string for the first page) rows are selected with a keyset
+    comparison on the sort columns, so every page costs the same regardless of
+    depth, and the total is only counted when `include_total` is set. The last
+    column must be unique to make the order total.
+
+    When `count_key` is given the total is served from the count cache and
+    only recomputed after one of `count_tags` is invalidated.
+    """
+    ordered = query.order_by(*[column.desc() for column in order_by])
+
+    def count(count_query):
+        if count_key is None:
+            return count_query.count()
+        return cached_count(count_key, count_tags or [], count_query.count)
+
+    if cursor is None:
+        total = count(ordered)
+        items = ordered.offset(offset).limit(limit).all()
+        return PaginatedResponse(items=items, total=total, offset=offset, limit=limit)
+
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        ordered = ordered.filter(tuple_(*order_by) < tuple_(*values))
+
+    rows = ordered.limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column in order_by])
+
+    total = count(query) if include_total else None
+    return PaginatedResponse(items=items, total=total, offset=0, limit=limit, next_cursor=next_cursor)
@@ -0,0 +1,21 @@
+from sqlalchemy.orm import Query, defer
+
+from ..models import Post
+from ..schemas import PostSummary, PostView
+
+def apply_view(query: Query, view: PostView) -> Query:
+    """
+    Restrict a post query to the columns a view needs.
+
+    Summaries never select `content`; reading it anyway raises instead of
+    silently issuing a query per row.
+    """
+    if view == "summary":
+        return query.options(defer(Post.content, raiseload=True))
+    return query
+
+def render_view(posts: list, view: PostView) -> list:
+    """Convert loaded posts to summaries before the response model reads them"""
+    if view == "summary":
+        return [PostSummary.model_validate(post) for post in posts]
+    return posts
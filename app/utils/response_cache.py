@@ -0,0 +1,85 @@
+import functools
+import inspect
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from ..db.routing import extend_signature, json_response, json_serializer
+from .cache import app_cache, response_cache
+from .invalidation import versions
+
+def _request_key(request: Request, tags: list[str]) -> str:
+    resolved = [tag.format(**request.path_params) for tag in tags]
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"response:{request.url.path}?{query}:{':'.join(versions(resolved))}"
+
+def _lookup(request: Request, tags: list[str]) -> tuple[str, bytes | None]:
+    key = _request_key(request, tags)
+    return key, response_cache.get(key)
+
+async def _off_loop(func, *args):
+    """Call `func` in the threadpool when a cache backend it uses blocks on the network"""
+    if app_cache.blocking or response_cache.blocking:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+def cached_value(key: str, tags: list[str], build: Callable[[], Any]) -> Any:
+    """
+    Return a value from the response cache, building it on a miss.
+
+    For handlers that cannot be cached whole, e.g. because they also record
+    a view. The entry is stored under the current versions of `tags`.
+    """
+    cache_key = f"value:{key}:{':'.join(versions(tags))}"
+    value = response_cache.get(cache_key)
+    if value is None:
+        value = build()
+        response_cache.set(cache_key, value)
+    return value
+
+def cache_response(tags: list[str]):
+    """
+    Mark a GET endpoint for the response cache.
+
+    The response is serialized once with the route's response model and the
+    bytes are stored under the request path, its sorted query string and the
+    current versions of `tags`. Tags may reference path parameters, e.g.
+    "post:{post_id}". Invalidating a tag makes every response cached against
+    it unreachable. DatabaseRouter installs the cache when the route is
+    added, since only then is the response model known.
+    """
+    def decorator(endpoint):
+        endpoint.install_response_cache = functools.partial(install_response_cache, tags=tags)
+        return endpoint
+    return decorator
+
+def install_response_cache(endpoint, response_model: Any, tags: list[str]):
+    """Wrap an endpoint so it is served from the response cache"""
+    serialize = json_serializer(response_model)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, _request: Request, _response: Response, **kwargs):
+            key, content = await _off_loop(_lookup, _request, tags)
+            if content is None:
+                result = await endpoint(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                content = serialize(result)
+                await _off_loop(response_cache.set, key, content)
+            return json_response(content, _response)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, _request: Request, _response: Response, **kwargs):
+            key, content = _lookup(_request, tags)
+            if content is None:
+                result = endpoint(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                content = serialize(result)
+                response_cache.set(key, content)
+            return json_response(content, _response)
+
+    return extend_signature(wrapper, endpoint, _request=Request, _response=Response)
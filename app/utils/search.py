@@ -0,0 +1,102 @@
+import os
+import re
+
+from sqlalchemy import cast, false, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, TSVECTOR
+from sqlalchemy.orm import Query, Session, selectinload, with_expression
+
+from ..models import Post, Tag
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "ilike")
+SEARCH_VIEW_WEIGHT = float(os.getenv("SEARCH_VIEW_WEIGHT", "0.1"))
+TAG_SEARCH_LIMIT = 5
+
+# Text search configuration used by the generated posts.search_vector column
+SEARCH_CONFIG = "english"
+
+# Weighted title (A), summary (B) and content (C) vector, generated and GIN
+# indexed by the database; it is not mapped on Post so SQLite can create the schema
+search_vector = literal_column("posts.search_vector", TSVECTOR)
+
+def prefix_tsquery(q: str) -> str | None:
+    """
+    Build a to_tsquery string that prefix matches every word of the input.
+
+    "pyth tut" becomes "pyth:* & tut:*". Returns None if the input has no
+    searchable words.
+    """
+    words = re.findall(r"\w+", q.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+def _ilike_search(db: Session, q: str) -> tuple[Query, list]:
+    query = db.query(Post).options(selectinload(Post.tags)).filter(
+        or_(
+            Post.title.ilike(f"%{q}%"),
+            Post.summary.ilike(f"%{q}%")
+        )
+    )
+    return query, [Post.view_count, Post.created_at, Post.id]
+
+def _fulltext_search(db: Session, q: str) -> tuple[Query, list]:
+    tsquery = prefix_tsquery(q)
+    if tsquery is None:
+        return db.query(Post).filter(false()), [Post.created_at, Post.id]
+
+    query_vector = func.to_tsquery(SEARCH_CONFIG, tsquery)
+    rank = func.ts_rank(search_vector, query_vector) * (1 + SEARCH_VIEW_WEIGHT * func.ln(1 + Post.view_count))
+    rank = rank.label("search_rank")
+    query = db.query(Post).options(selectinload(Post.tags), with_expression(Post.search_rank, rank)).filter(
+        search_vector.op("@@")(query_vector)
+    )
+    return query, [rank, Post.created_at, Post.id]
+
+def _trigram_search(db: Session, q: str) -> tuple[Query, list]:
+    # similarity() is a real; as a double its value survives the cursor's
+    # round trip exactly, so the keyset comparison does not repeat a row
+    similarity = cast(func.similarity(Post.title, q), DOUBLE_PRECISION).label("search_rank")
+    query = db.query(Post).options(selectinload(Post.tags), with_expression(Post.search_rank, similarity)).filter(
+        or_(
+            Post.title.ilike(f"%{q}%"),
+            Post.title.op("%")(q),
+            Post.summary.ilike(f"%{q}%")
+        )
+    )
+    return query, [similarity, Post.view_count, Post.created_at, Post.id]
+
+SEARCH_BACKENDS = {
+    "ilike": _ilike_search,
+    "fulltext": _fulltext_search,
+    "trigram": _trigram_search,
+}
+
+def search_posts(db: Session, q: str, backend: str = SEARCH_BACKEND) -> tuple[Query, list]:
+    """
+    Build the post search query for the configured backend.
+
+    Returns the filtered query and the columns to sort it by, descending, in
+    the form `paginate` expects.
+
+    - ilike: substring match on title and summary, most viewed first
+    - fulltext: prefix match against the weighted search vector, ranked by
+      relevance blended with view_count (PostgreSQL only)
+    - trigram: substring or fuzzy (pg_trgm `%`) match, closest title first,
+      tolerating typos (PostgreSQL only)
+    """
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {backend}")
+    return SEARCH_BACKENDS[backend](db, q)
+
+def search_tags(db: Session, q: str, backend: str = SEARCH_BACKEND) -> Query:
+    """
+    Build the ordered tag search query for the configured backend.
+
+    Tags are matched by name substring; the trigram backend also accepts
+    fuzzy matches and puts the closest names first.
+    """
+    if backend == "trigram":
+        return db.query(Tag).filter(
+            or_(Tag.name.ilike(f"%{q}%"), Tag.name.op("%")(q))
+        ).order_by(func.similarity(Tag.name, q).desc(), Tag.created_at.desc())
+    return db.query(Tag).filter(
+        Tag.name.ilike(f"%{q}%")
+    ).order_by(Tag.created_at.desc())
@@ -1,5 +1,9 @@
 import re
+from contextlib import contextmanager
+from typing import Iterable
 from fastapi import HTTPException
+from sqlalchemy import exists, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 def slugify(text: str) -> str:
@@ -23,6 +27,10 @@ def validate_unique_slug(slug: str, model, db: Session) -> None:
     """
     Validate that a slug is unique for a given model.
 
+    Existence is checked with an EXISTS query, so no row is loaded. A
+    concurrent insert of the same slug can still win the race; the unique
+    constraint then rejects the commit (see `commit_unique`).
+
     Args:
         slug: The slug to validate
         model: The SQLAlchemy model to check against
@@ -31,10 +39,79 @@ def validate_unique_slug(slug: str, model, db: Session) -> None:
     Raises:
         HTTPException: 400 error if slug already exists
     """
-    existing = db.query(model).filter(model.slug == slug).first()
-    if existing:
+    if db.scalar(select(exists().where(model.slug == slug))):
         model_name = model.__name__
         raise HTTPException(
             status_code=400,
             detail=f"{model_name} with this slug already exists"
         )
+
+def validate_unique_slugs(slugs: list[str], model, db: Session) -> None:
+    """
+    Validate many slugs at once with a single query.
+
+    Raises:
+        HTTPException: 400 error naming every slug that already exists
+    """
+    if not slugs:
+        return
+    taken = db.scalars(select(model.slug).where(model.slug.in_(slugs))).all()
+    if taken:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{model.__name__} with this slug already exists: {', '.join(sorted(taken))}"
+        )
+
+def unique_slugs(bases: list[str], model, db: Session, reserved: Iterable[str] = ()) -> list[str]:
+    """
+    Make each slug unique by appending -2, -3, ... when it is taken.
+
+    Every existing slug that could collide (`base` or `base-...`) is read in
+    one query. Slugs in `reserved` and slugs assigned earlier in the list
+    count as taken, so repeated bases get increasing suffixes.
+    """
+    if not bases:
+        return []
+    distinct = list(dict.fromkeys(bases))
+    candidates = [model.slug.in_(distinct)] + [model.slug.like(f"{_escape_like(base)}-%", escape="\\") for base in distinct]
+    taken = set(db.scalars(select(model.slug).where(or_(*candidates)))) | set(reserved)
+
+    slugs = []
+    for base in bases:
+        slug, suffix = base, 2
+        while slug in taken:
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+def unique_slug(base: str, model, db: Session) -> str:
+    """Return `base`, or `base` with the first free -2, -3, ... suffix"""
+    return unique_slugs([base], model, db)[0]
+
+@contextmanager
+def reporting_conflicts(db: Session, model):
+    """
+    Turn a unique-constraint violation inside the block into a 409.
+
+    Slug checks run before the write, so a concurrent write can still take
+    the same slug (or, for posts, the featured flag) first. The database
+    rejects the second write, the transaction is rolled back and the caller
+    gets a 409 to retry.
+    """
+    try:
+        yield
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"{model.__name__} conflicts with a concurrent update, retry the request"
+        )
+
+def commit_unique(db: Session, model) -> None:
+    """Commit, reporting a unique-constraint violation as a conflict"""
+    with reporting_conflicts(db, model):
+        db.commit()
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
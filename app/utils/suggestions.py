@@ -0,0 +1,214 @@
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Post, Tag
+from .invalidation import versions
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_REBUILD_INTERVAL = float(os.getenv("SUGGEST_REBUILD_INTERVAL", "300"))
+
+# Version tags that mean the indexed titles or names may have changed
+WATCHED_TAGS = ["post-list", "tag-list"]
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words"""
+    return re.findall(r"\w+", text.lower())
+
+class Entry(NamedTuple):
+    words: tuple
+    rank: tuple
+    payload: dict
+
+class PrefixIndex:
+    """
+    In-memory word prefix index.
+
+    Distinct words are kept in one sorted list, so the words starting with a
+    prefix are a contiguous range found by binary search. Each word has a
+    posting list of entries already sorted best first (highest score, then
+    label), and a lookup lazily merges the postings in that range, stopping
+    as soon as `limit` entries match. A query matches an entry when every
+    query word is a prefix of one of the entry's words.
+    """
+
+    def __init__(self):
+        self._words = []
+        self._postings = {}
+        self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry(key, text, payload, score):
+        return Entry(tuple(sorted(set(tokenize(text)))), (-score, text.lower(), key), payload)
+
+    def add(self, key: int, text: str, payload: dict, score: int = 0) -> None:
+        """Index an entry, replacing any existing entry with the same key"""
+        self.remove(key)
+        entry = self._entry(key, text, payload, score)
+        for word in entry.words:
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = []
+                insort(self._words, word)
+            insort(postings, entry.rank)
+        self._entries[key] = entry
+
+    def load(self, items) -> None:
+        """Bulk index `(key, text, payload, score)` items, sorting once at the end"""
+        for key, text, payload, score in items:
+            entry = self._entry(key, text, payload, score)
+            for word in entry.words:
+                self._postings.setdefault(word, []).append(entry.rank)
+            self._entries[key] = entry
+        for postings in self._postings.values():
+            postings.sort()
+        self._words = sorted(self._postings)
+
+    def remove(self, key: int) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for word in entry.words:
+            postings = self._postings[word]
+            del postings[bisect_left(postings, entry.rank)]
+            if not postings:
+                del self._postings[word]
+                del self._words[bisect_left(self._words, word)]
+
+    def search(self, q: str, limit: int = 10) -> list[dict]:
+        """Return the payloads of the best `limit` matches, highest score first"""
+        words = tokenize(q)
+        if not words:
+            return []
+
+        # Walk the narrowest range, then check the remaining words per entry
+        longest = max(words, key=len)
+        rest = [word for word in words if word != longest]
+        postings = []
+        for i in range(bisect_left(self._words, longest), len(self._words)):
+            if not self._words[i].startswith(longest):
+                break
+            postings.append(self._postings[self._words[i]])
+
+        results = []
+        seen = set()
+        for _, _, key in heapq.merge(*postings):
+            if key in seen:
+                continue
+            seen.add(key)
+            entry = self._entries[key]
+            if all(any(indexed.startswith(word) for indexed in entry.words) for word in rest):
+                results.append(entry.payload)
+                if len(results) == limit:
+                    break
+        return results
+
+class SuggestionIndex:
+    """
+    Per-process autocomplete index over post titles and tag names.
+
+    Write handlers apply their change directly, passing the version tokens
+    their invalidate() call set. Changes made by other workers are picked up
+    by a full rebuild when the post-list or tag-list version moves on without
+    this process having applied it, and at least every
+    SUGGEST_REBUILD_INTERVAL seconds.
+    """
+
+    def __init__(self, rebuild_interval: float = SUGGEST_REBUILD_INTERVAL):
+        self.rebuild_interval = rebuild_interval
+        self.posts = PrefixIndex()
+        self.tags = PrefixIndex()
+        self._versions = None
+        self._built_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        if not self.built or time.monotonic() - self._built_at >= self.rebuild_interval:
+            return True
+        return versions(WATCHED_TAGS) != self._versions
+
+    def rebuild(self, db: Session) -> None:
+        """Load every post title and tag name from the database"""
+        # Read versions first so a write landing mid-load triggers another rebuild
+        current = versions(WATCHED_TAGS)
+        posts = PrefixIndex()
+        posts.load(
+            (id, title, {"id": id, "title": title, "slug": slug}, view_count)
+            for id, title, slug, view_count in db.query(Post.id, Post.title, Post.slug, Post.view_count)
+        )
+        tags = PrefixIndex()
+        tags.load(
+            (id, name, {"id": id, "name": name, "slug": slug}, 0)
+            for id, name, slug in db.query(Tag.id, Tag.name, Tag.slug)
+        )
+
+        with self._lock:
+            self.posts, self.tags = posts, tags
+            self._versions = current
+            self._built_at = time.monotonic()
+
+    def suggest(self, db: Session, q: str, limit: int = 10) -> dict:
+        """Suggest posts and tags for a partial query, rebuilding first if stale"""
+        if self.is_stale():
+            self.rebuild(db)
+        with self._lock:
+            return {"posts": self.posts.search(q, limit), "tags": self.tags.search(q, limit)}
+
+    def _apply(self, change, tokens: dict[str, str]) -> None:
+        # Nothing to patch before the first build, which will load the change
+        if not self.built:
+            return
+        with self._lock:
+            change()
+            # `tokens` are what this worker's invalidate() set; if any watched
+            # version differs from them another write landed too, so the old
+            # versions are kept and the next read rebuilds
+            expected = [tokens.get(tag, version) for tag, version in zip(WATCHED_TAGS, self._versions)]
+            if versions(WATCHED_TAGS) == expected:
+                self._versions = expected
+
+    def update_post(self, post, tokens: dict[str, str]) -> None:
+        self._apply(lambda: self.posts.add(post.id, post.title, {"id": post.id, "title": post.title, "slug": post.slug}, post.view_count), tokens)
+
+    def remove_post(self, post_id: int, tokens: dict[str, str]) -> None:
+        self._apply(lambda: self.posts.remove(post_id), tokens)
+
+    def update_tag(self, tag, tokens: dict[str, str]) -> None:
+        self._apply(lambda: self.tags.add(tag.id, tag.name, {"id": tag.id, "name": tag.name, "slug": tag.slug}), tokens)
+
+    def remove_tag(self, tag_id: int, tokens: dict[str, str]) -> None:
+        self._apply(lambda: self.tags.remove(tag_id), tokens)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.posts = PrefixIndex()
+            self.tags = PrefixIndex()
+            self._versions = None
+            self._built_at = None
+
+    def warm(self, session_factory) -> None:
+        """Build the index at startup; on failure the first request builds it"""
+        db = session_factory()
+        try:
+            self.rebuild(db)
+        except Exception:
+            logger.exception("Failed to build the suggestion index")
+        finally:
+            db.close()
+
+suggestion_index = SuggestionIndex()
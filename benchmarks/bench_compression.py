@@ -0,0 +1,124 @@
+"""
+Bytes and CPU per response for each compression setting.
+
+Builds three representative payloads: a 10-post /posts/ page with full
+content, a 200-comment /comments/post/{id}/all tree and rss.xml for 200
+posts. Each is compressed with gzip at levels 1/6/9 and, when the `brotli`
+package is installed, brotli at qualities 4/11. Per-response compression
+is what the middleware pays on every request. Cached feeds pay it once per
+content change, at the precompression settings (gzip 9, brotli 11).
+
+Usage:
+    python -m benchmarks.bench_compression [--repeat 50]
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# app.db builds an engine at import time; the benchmark never connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/blog")
+
+from app.models import Base, Post
+from app.routers.sitemap import build_rss
+from app.utils.compression import brotli
+
+WORDS = (
+    "the of and to in is that for it as with was on be by this are from at or an have not which but "
+    "database query index cache request response server client python async session pool connection "
+    "latency throughput memory page cursor post comment tag feed search token version worker process "
+    "performance benchmark compression header stream batch write read update delete insert select"
+).split()
+
+
+def text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def posts_page(rng):
+    created = datetime(2026, 1, 1)
+    return json.dumps({
+        "items": [
+            {
+                "id": i, "title": text(rng, 6), "slug": f"post-{i}", "summary": text(rng, 30),
+                "content": "\n\n".join(text(rng, 120) for _ in range(12)),
+                "read_time_minutes": 7, "featured": False, "view_count": rng.randint(0, 5000),
+                "comment_count": rng.randint(0, 40), "created_at": created.isoformat(), "updated_at": created.isoformat(),
+                "tags": [{"id": t, "name": f"Tag {t}", "slug": f"tag-{t}"} for t in rng.sample(range(40), 5)]
+            }
+            for i in range(10)
+        ],
+        "total": None, "offset": 0, "limit": 10, "next_cursor": None
+    }).encode()
+
+
+def comment_tree(rng):
+    def comment(i, depth):
+        return {
+            "id": i, "post_id": 1, "parent_id": None, "depth": depth, "author_name": f"Reader {i}",
+            "content": text(rng, rng.randint(10, 80)), "like_count": rng.randint(-3, 50),
+            "created_at": "2026-01-01T00:00:00", "replies": []
+        }
+
+    roots = []
+    for i in range(40):
+        root = comment(i * 5, 0)
+        parent = root
+        for depth in range(1, 5):
+            reply = comment(i * 5 + depth, depth)
+            parent["replies"].append(reply)
+            parent = reply
+        roots.append(root)
+    return json.dumps(roots).encode()
+
+
+def rss_feed(rng):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        for i in range(200):
+            created = datetime(2026, 1, 1) + timedelta(days=i)
+            db.add(Post(title=text(rng, 6), slug=f"post-{i}", summary=text(rng, 30), content="", read_time_minutes=1, created_at=created, updated_at=created))
+        db.commit()
+        return build_rss(db)[0]
+
+
+def encoders():
+    yield "gzip-1", lambda body: gzip.compress(body, compresslevel=1, mtime=0)
+    yield "gzip-6", lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    yield "gzip-9", lambda body: gzip.compress(body, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield "br-4", lambda body: brotli.compress(body, quality=4)
+        yield "br-11", lambda body: brotli.compress(body, quality=11)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    payloads = {"posts page": posts_page(rng), "comment tree": comment_tree(rng), "rss.xml": rss_feed(rng)}
+    if brotli is None:
+        print("brotli is not installed; only gzip is measured\n")
+
+    print(f"{'payload':>13} {'encoding':>9} {'bytes':>9} {'ratio':>6} {'cpu ms':>8}")
+    for name, body in payloads.items():
+        print(f"{name:>13} {'identity':>9} {len(body):>9} {1:>6.2f} {0:>8.3f}")
+        for label, encode in encoders():
+            start = time.process_time()
+            for _ in range(args.repeat):
+                compressed = encode(body)
+            cpu = (time.process_time() - start) / args.repeat * 1000
+            print(f"{name:>13} {label:>9} {len(compressed):>9} {len(body) / len(compressed):>6.2f} {cpu:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
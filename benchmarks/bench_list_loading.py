@@ -0,0 +1,119 @@
+"""
+Compare loader strategies for the post listing endpoints.
+
+Seeds an in-memory SQLite database with posts carrying 5-10 tags each and
+loads pages of 10/50/100 posts the way get_posts used to (joinedload with
+offset/limit), the way search used to (no loader, lazy tags) and the way the
+list endpoints do now (selectinload). For each strategy it reports SQL round
+trips, rows returned by the database, an estimate of the bytes in those rows
+and the mean time per page.
+
+Usage:
+    python -m benchmarks.bench_list_loading [--posts 1000] [--repeat 20]
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Post, Tag
+
+
+class StatementRecorder:
+    """Collects every statement the engine sends to the database"""
+
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def reset(self):
+        self.statements = []
+
+
+def seed(db, post_count, tag_count=40):
+    tags = [Tag(name=f"Tag {i}", slug=f"tag-{i}") for i in range(tag_count)]
+    db.add_all(tags)
+    rng = random.Random(42)
+    for i in range(post_count):
+        db.add(Post(
+            title=f"Post {i}",
+            slug=f"post-{i}",
+            summary="A short summary of the post " * 3,
+            content="Lorem ipsum dolor sit amet " * 400,
+            read_time_minutes=5,
+            tags=rng.sample(tags, rng.randint(5, 10))
+        ))
+    db.commit()
+
+
+STRATEGIES = {
+    "joinedload": lambda query: query.options(joinedload(Post.tags)),
+    "lazy": lambda query: query,
+    "selectinload": lambda query: query.options(selectinload(Post.tags)),
+}
+
+
+def load_page(db, strategy, limit):
+    query = STRATEGIES[strategy](db.query(Post)).filter(Post.featured == False)
+    posts = query.order_by(Post.created_at.desc(), Post.id.desc()).offset(limit).limit(limit).all()
+    # Touch what PostResponse serializes
+    return [(post.id, [tag.name for tag in post.tags]) for post in posts]
+
+
+def measure_rows(engine, statements):
+    """Replay captured statements to count rows and bytes returned"""
+    rows = 0
+    size = 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for statement, parameters in statements:
+            cursor.execute(statement, parameters)
+            for row in cursor.fetchall():
+                rows += 1
+                size += sum(len(str(value)) for value in row if value is not None)
+    finally:
+        raw.close()
+    return rows, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        seed(db, args.posts)
+
+    recorder = StatementRecorder(engine)
+
+    print(f"{'page':>5} {'strategy':>13} {'queries':>8} {'rows':>7} {'kbytes':>9} {'ms/page':>9}")
+    for limit in (10, 50, 100):
+        for strategy in STRATEGIES:
+            recorder.reset()
+            with Session() as db:
+                load_page(db, strategy, limit)
+            statements = list(recorder.statements)
+            rows, size = measure_rows(engine, statements)
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                with Session() as db:
+                    load_page(db, strategy, limit)
+            elapsed = (time.perf_counter() - start) / args.repeat
+
+            print(f"{limit:>5} {strategy:>13} {len(statements):>8} {rows:>7} {size / 1024:>9.1f} {elapsed * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare the full and summary views of the post listing.
+
+Seeds an in-memory SQLite database with posts of ~10 KB content and 5-10
+tags each, then builds pages of 10 and 50 posts the way get_posts does for
+`view=full` and `view=summary`. For each it reports the mean time to load
+and validate the page, the mean time to serialize it with the endpoint's
+response model and the size of the JSON body.
+
+Usage:
+    python -m benchmarks.bench_post_views [--posts 1000] [--repeat 50]
+"""
+import argparse
+import os
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# app.db builds an engine at import time; the benchmark never connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/blog")
+
+from app.models import Base, Post
+from app.schemas import PaginatedResponse, PostResponse, PostSummary
+from app.utils.pagination import paginate
+from app.utils.post_views import apply_view, render_view
+
+from benchmarks.bench_list_loading import seed
+
+adapter = TypeAdapter(PaginatedResponse[PostResponse | PostSummary])
+
+
+def load_page(db, view, limit):
+    query = apply_view(db.query(Post).options(selectinload(Post.tags)).filter(Post.featured == False), view)
+    page = paginate(query, [Post.created_at, Post.id], 0, limit, cursor="")
+    page.items = render_view(page.items, view)
+    return adapter.validate_python(page, from_attributes=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        seed(db, args.posts)
+
+    print(f"{'page':>5} {'view':>8} {'load ms':>8} {'dump ms':>8} {'kbytes':>8}")
+    for limit in (10, 50):
+        for view in ("full", "summary"):
+            load = dump = 0.0
+            for _ in range(args.repeat):
+                with Session() as db:
+                    start = time.perf_counter()
+                    page = load_page(db, view, limit)
+                    load += time.perf_counter() - start
+
+                start = time.perf_counter()
+                body = adapter.dump_json(page)
+                dump += time.perf_counter() - start
+
+            print(f"{limit:>5} {view:>8} {load / args.repeat * 1000:>8.2f} {dump / args.repeat * 1000:>8.3f} {len(body) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
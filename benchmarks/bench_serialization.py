@@ -0,0 +1,114 @@
+"""
+Compare JSON serialization paths for response models.
+
+Loads a page of 50 posts with their tags and a 200-comment tree from an
+in-memory SQLite database as ORM objects, then serializes each the way
+FastAPI does by default (validate, convert to JSON-compatible Python, then
+json.dumps), the same with orjson rendering (ORJSONResponse, only when
+`orjson` is installed) and the way FAST_JSON does (one TypeAdapter
+validate + dump_json call). Reports the mean time per response.
+
+Usage:
+    python -m benchmarks.bench_serialization [--repeat 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# app.db builds an engine at import time; the benchmark never connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/blog")
+
+from app.db.routing import json_serializer, orjson
+from app.models import Base, Comment, Post
+from app.schemas import CommentResponse, PaginatedResponse, PostResponse
+from app.utils.comment_tree import build_comment_tree
+
+from benchmarks.bench_list_loading import seed
+
+
+def seed_comments(db, post_id, count=200):
+    rng = random.Random(42)
+    comments = []
+    for i in range(count):
+        parent = rng.choice(comments) if comments and rng.random() < 0.6 else None
+        if parent is not None and parent.depth >= 4:
+            parent = None
+        comment = Comment(
+            post_id=post_id,
+            parent_id=parent.id if parent else None,
+            root_id=(parent.root_id or parent.id) if parent else None,
+            depth=parent.depth + 1 if parent else 0,
+            author_name=f"Reader {i}",
+            content="Thanks for writing this up, it helped a lot. " * rng.randint(1, 6),
+            like_count=rng.randint(0, 50)
+        )
+        db.add(comment)
+        db.flush()
+        comments.append(comment)
+    db.commit()
+
+
+def default_path(response_model):
+    """FastAPI's own response handling for a route declaring `response_model`"""
+    field = APIRoute("/", lambda: None, response_model=response_model).response_field
+    loop = asyncio.new_event_loop()
+
+    def serialize(result, response_class=JSONResponse):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=result))
+        return response_class(content).body
+    return serialize
+
+
+def measure(serialize, result, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = serialize(result)
+    return (time.perf_counter() - start) / repeat, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    with Session() as db:
+        seed(db, 100)
+        seed_comments(db, 1)
+
+    with Session() as db:
+        posts = db.query(Post).options(selectinload(Post.tags)).order_by(Post.id).limit(50).all()
+        page = PaginatedResponse(items=posts, total=100, offset=0, limit=50)
+        tree = build_comment_tree(db.query(Comment).filter(Comment.post_id == 1).all())
+
+        payloads = [
+            ("posts page", PaginatedResponse[PostResponse], page),
+            ("comment tree", list[CommentResponse], tree)
+        ]
+        print(f"{'payload':>13} {'path':>16} {'ms':>8} {'kbytes':>8}")
+        for name, response_model, result in payloads:
+            default = default_path(response_model)
+            paths = [("default", default)]
+            if orjson is not None:
+                paths.append(("default+orjson", lambda result: default(result, ORJSONResponse)))
+            paths.append(("typeadapter", json_serializer(response_model)))
+
+            # Convert a result first so lazy loads are not timed
+            paths[-1][1](result)
+            for label, serialize in paths:
+                elapsed, size = measure(serialize, result, args.repeat)
+                print(f"{name:>13} {label:>16} {elapsed * 1000:>8.3f} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
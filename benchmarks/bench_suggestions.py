@@ -0,0 +1,78 @@
+"""
+Size and latency of the in-memory autocomplete index.
+
+Builds the post title and tag name prefix indexes for 1k/10k/100k posts and
+reports build time, memory held by the index (tracemalloc) and the median
+and p99 lookup time for 1 to 4 character prefixes and two-word queries.
+
+Usage:
+    python -m benchmarks.bench_suggestions [--sizes 1000 10000 100000] [--lookups 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+# app.db builds an engine at import time; the index never connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/blog")
+
+from app.utils.suggestions import PrefixIndex
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "tor", "vus", "pel", "dra", "sin", "qua", "bet", "zon", "hal", "fir", "gom"]
+
+
+def make_vocabulary(rng, size=3000):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def build(rng, vocabulary, size):
+    titles = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 8))).title() for _ in range(size)]
+    posts = PrefixIndex()
+    posts.load((i, title, {"id": i, "title": title, "slug": f"post-{i}"}, rng.randint(0, 5000)) for i, title in enumerate(titles))
+    tags = PrefixIndex()
+    tags.load((i, word, {"id": i, "name": word, "slug": word}, 0) for i, word in enumerate(vocabulary[:500]))
+    return posts, tags
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+
+    print(f"{'posts':>7} {'build ms':>9} {'MiB':>7} {'query':>8} {'p50 us':>8} {'p99 us':>8}")
+    for size in args.sizes:
+        tracemalloc.start()
+        start = time.perf_counter()
+        posts, tags = build(rng, vocabulary, size)
+        build_ms = (time.perf_counter() - start) * 1000
+        memory = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+
+        queries = {f"{n} char": [rng.choice(vocabulary)[:n] for _ in range(args.lookups)] for n in (1, 2, 3, 4)}
+        queries["2 words"] = [f"{rng.choice(vocabulary)} {rng.choice(vocabulary)[:3]}" for _ in range(args.lookups)]
+
+        for name, terms in queries.items():
+            samples = []
+            for q in terms:
+                start = time.perf_counter()
+                posts.search(q)
+                tags.search(q)
+                samples.append((time.perf_counter() - start) * 1e6)
+            print(f"{size:>7} {build_ms:>9.0f} {memory:>7.1f} {name:>8} {statistics.median(samples):>8.1f} {percentile(samples, 0.99):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()